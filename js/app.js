@@ -1,13 +1,13 @@
 /**
  * Topina League — SPA Router & Init
  */
-import { initHome } from './sections/home.js?v=21';
-import { initGameCenter } from './sections/game-center.js?v=28';
-import { initStandings } from './sections/standings.js?v=25';
-import { initDraft } from './sections/draft.js?v=21';
-import { initStats } from './sections/stats.js?v=21';
-import { initHistory } from './sections/history.js?v=21';
-import { initTeam } from './sections/team.js?v=1';
+import { initHome } from './sections/home.js?v=23';
+import { initGameCenter } from './sections/game-center.js?v=30';
+import { initStandings } from './sections/standings.js?v=27';
+import { initDraft } from './sections/draft.js?v=23';
+import { initStats } from './sections/stats.js?v=23';
+import { initHistory } from './sections/history.js?v=23';
+import { initTeam } from './sections/team.js?v=3';
 import { initMagazine } from './sections/magazine.js';
 import { initNavbar } from './ui/navbar.js';
 
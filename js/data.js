@@ -4,6 +4,7 @@
  */
 import { db } from './firebase-config.js';
 import { ref, child, get } from 'https://www.gstatic.com/firebasejs/11.0.2/firebase-database.js';
+import { decodeFantasyData } from './data/fantasy-schema.js?v=2';
 
 // Available seasons in the database
 export const SEASONS = ['2019', '2020', '2021', '2022', '2023', '2024', '2025'];
@@ -29,7 +30,7 @@ export async function fetchFantasyData(season) {
         const dbRef = ref(db);
         const fetchPromise = get(child(dbRef, `fantasy/fantasy_data_${season}`));
         const snap = await Promise.race([fetchPromise, timeout]);
-        return snap.exists() ? snap.val() : null;
+        return snap.exists() ? decodeFantasyData(snap.val()) : null;
     } catch (e) {
         console.error(`fetchFantasyData error for ${season}:`, e);
         return null;
@@ -0,0 +1,78 @@
+/**
+ * Fantasy Data Schema
+ * Decoder for the compact published format written by scripts/compact_schema.py.
+ *
+ * Compact seasons carry `schema: 'compact-v1'`, a manager table (`teams`), a
+ * per-season player table (`players`: [name, position_in_team, nfl_team]) and
+ * weeks whose player lines are
+ * [playerId, points, opponent, result, teamScore, oppScore, slot?]
+ * (result '?' carries an unrecognised status string as teamScore).
+ * Decoding restores the scraped shape, so consumers keep reading
+ * `weeks[n].matchups[i].team1.starters[j].fantasy_points` etc.
+ */
+
+export const COMPACT_SCHEMA = 'compact-v1';
+
+const RESULT_NAMES = { W: 'Win', L: 'Loss', T: 'Tie', C: 'CAN' };
+// A status the encoder did not recognise is kept verbatim in the team score slot.
+const RAW_RESULT = '?';
+const BENCH_SLOT = 'BN';
+
+// RTDB hands back arrays as objects when they are sparse; normalise both.
+const asList = (value) => (value ? Object.values(value) : []);
+
+const formatPoints = (value) => Number(value || 0).toFixed(2);
+
+function decodeLine(line, players, defaultSlot) {
+    const [name, positionInTeam, nflTeam] = players[line[0]] || ['', '', ''];
+    const result = line[3] || '';
+    return {
+        position: line[6] ?? (defaultSlot || positionInTeam),
+        name,
+        position_in_team: positionInTeam,
+        nfl_team: nflTeam,
+        opponent: line[2] || '',
+        status: result === RAW_RESULT ? String(line[4] ?? '')
+            : result ? `${RESULT_NAMES[result]}, ${line[4]}-${line[5]}` : '',
+        fantasy_points: formatPoints(line[1])
+    };
+}
+
+function decodeTeam(team, teams, players) {
+    return {
+        name: teams[team.t],
+        score: formatPoints(team.s),
+        starters: asList(team.st).map(line => decodeLine(line, players, null)),
+        bench: asList(team.bn).map(line => decodeLine(line, players, BENCH_SLOT))
+    };
+}
+
+export function isCompactFantasyData(data) {
+    return data?.schema === COMPACT_SCHEMA;
+}
+
+/**
+ * Expand a compact season into the scraped fantasy_data shape.
+ * Legacy (already expanded) payloads are returned unchanged.
+ */
+export function decodeFantasyData(data) {
+    if (!isCompactFantasyData(data)) return data;
+
+    const teams = asList(data.teams);
+    const players = asList(data.players);
+    const weeks = {};
+
+    Object.entries(data.weeks || {}).forEach(([weekNum, matchups]) => {
+        weeks[weekNum] = {
+            matchups: asList(matchups).map(m => {
+                const decoded = {};
+                if (m.team1) decoded.team1 = decodeTeam(m.team1, teams, players);
+                if (m.team2) decoded.team2 = decodeTeam(m.team2, teams, players);
+                return decoded;
+            })
+        };
+    });
+
+    const { league_id, season, scraped_at } = data;
+    return { league_id, season, scraped_at, weeks };
+}
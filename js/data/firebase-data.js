@@ -5,6 +5,7 @@
 import { db } from '../firebase-config.js';
 import { ref, child, get } from 'https://www.gstatic.com/firebasejs/11.0.2/firebase-database.js';
 import { CURRENT_SEASON } from './team-config.js';
+import { decodeFantasyData } from './fantasy-schema.js?v=2';
 
 /**
  * Fetch draft data from Realtime Database
@@ -27,7 +28,7 @@ export async function fetchFantasyData(season = CURRENT_SEASON) {
     try {
         const dbRef = ref(db);
         const snapshot = await get(child(dbRef, `fantasy/fantasy_data_${season}`));
-        return snapshot.exists() ? snapshot.val() : null;
+        return snapshot.exists() ? decodeFantasyData(snapshot.val()) : null;
     } catch (error) {
         console.error('Error fetching fantasy data:', error);
         return null;
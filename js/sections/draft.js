@@ -2,7 +2,7 @@
  * Draft Section
  * Year selector + Round filter → draft pick cards
  */
-import { fetchDraftData, flattenDraft, displayName, SEASONS, CURRENT_SEASON } from '../data.js';
+import { fetchDraftData, flattenDraft, displayName, SEASONS, CURRENT_SEASON } from '../data.js?v=23';
 import { TEAM_KEYS } from '../data/team-config.js';
 import { playerImageService } from '../services/player-image-service.js?v=4';
 import { db } from '../firebase-config.js';
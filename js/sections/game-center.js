@@ -1,4 +1,4 @@
-import { fetchFantasyData, getWeekCount, displayName, SEASONS, CURRENT_SEASON, getSeasonConfig } from '../data.js?v=5';
+import { fetchFantasyData, getWeekCount, displayName, SEASONS, CURRENT_SEASON, getSeasonConfig } from '../data.js?v=23';
 import { TEAM_LOGOS } from '../data/team-config.js?v=5';
 
 let currentData = null;
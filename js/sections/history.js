@@ -6,7 +6,7 @@
  *  - Champion
  *  - Dynamic season recap narratives
  */
-import { fetchFantasyData, processStandings, getSuperBowlMatchup, displayName, SEASONS } from '../data.js?v=5';
+import { fetchFantasyData, processStandings, getSuperBowlMatchup, displayName, SEASONS } from '../data.js?v=23';
 import { TEAM_LOGOS } from '../data/team-config.js?v=5';
 
 let loaded = false;
@@ -1,7 +1,7 @@
 /**
  * Home Section — Fetches and displays the reigning champion
  */
-import { fetchFantasyData, getSuperBowlMatchup, displayName, SEASONS } from '../data.js?v=5';
+import { fetchFantasyData, getSuperBowlMatchup, displayName, SEASONS } from '../data.js?v=23';
 
 let homeInitialized = false;
 
@@ -2,7 +2,7 @@
  * Standings Section
  * Standard Standings + Playoff Picture
  */
-import { fetchFantasyData, processStandings, displayName, CURRENT_SEASON, getPlayoffMatchups, getSuperBowlMatchup } from '../data.js?v=5';
+import { fetchFantasyData, processStandings, displayName, CURRENT_SEASON, getPlayoffMatchups, getSuperBowlMatchup } from '../data.js?v=23';
 
 let loaded = false;
 
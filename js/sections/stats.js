@@ -6,7 +6,7 @@
 
 // Wait, I can use `multi_replace_file_content` for this!
 
-import { fetchAllSeasonsData, fetchFantasyData, displayName, SEASONS, getSuperBowlMatchup, getSeasonConfig } from '../data.js?v=21';
+import { fetchAllSeasonsData, fetchFantasyData, displayName, SEASONS, getSuperBowlMatchup, getSeasonConfig } from '../data.js?v=23';
 import { TEAM_LOGOS } from '../data/team-config.js?v=21';
 
 let loaded = false;
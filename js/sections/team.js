@@ -4,7 +4,7 @@
  * Un'unica sezione che si ricostruisce al cambio di team.
  */
 
-import { fetchFantasyData, fetchDraftData, processStandings, getSuperBowlMatchup, flattenDraft, displayName, SEASONS } from '../data.js?v=5';
+import { fetchFantasyData, fetchDraftData, processStandings, getSuperBowlMatchup, flattenDraft, displayName, SEASONS } from '../data.js?v=23';
 import { TEAM_KEYS } from '../data/team-config.js?v=5';
 
 // Converte numero in romano minuscolo per il nome file
@@ -0,0 +1,260 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import compact_schema
+import config
+import generate_sleeper_map
+import history_db
+import league_model
+import league_stats
+import player_careers
+import reconcile
+import rollups
+import synth_league
+import upload_data_simple
+
+# Benchmark harness for the Python data pipeline.
+#
+# For every scale (TEAMSxSEASONS, e.g. 12x20) a synthetic league is generated
+# with synth_league.py and each pipeline stage is timed a few times:
+#
+#   parse       json.load of every fantasy season
+#   model       league_model.load_seasons (scores-only Season objects)
+#   encode      compact_schema.encode_season + minified dump (the published form)
+#   stats       league_stats.compute_all_time_stats
+#   careers     player_careers.build_career_index (rosters loaded + indexed)
+#   reconcile   reconcile.reconcile (rosters loaded + checked)
+#   rollups     rollups.compute_rollups (rosters loaded, cube + slices)
+#   history-db  full history_db.build into a fresh database
+#   map         generate_sleeper_map.build_map_js over the Sleeper dump
+#   upload      upload_data_simple.upload_all against a local RTDB stub
+#
+# Results are written as JSON so two runs can be compared:
+#
+#   python scripts/bench_pipeline.py --scale 4x7 --scale 12x20 --output build/bench/base.json
+#   python scripts/bench_pipeline.py --compare build/bench/base.json
+
+DEFAULT_SCALES = ['4x7', '12x20', '24x40']
+BENCH_DIR = os.path.join(config.BUILD_DIR, 'bench')
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Accepts RTDB REST writes (PUT/PATCH) and only counts them."""
+
+    def _accept(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.bytes_received += length
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_PUT = _accept
+    do_PATCH = _accept
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def local_rtdb_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.bytes_received = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def parse_scale(text):
+    parts = [int(p) for p in text.lower().split('x')]
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"scale must be TEAMSxSEASONS[xBENCH], got {text!r}")
+    teams, seasons = parts[:2]
+    bench = parts[2] if len(parts) == 3 else 6
+    return {'label': text, 'teams': teams, 'seasons': seasons, 'bench': bench}
+
+
+def _dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def _time(fn, repeat):
+    runs = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - started)
+    return {'min': min(runs), 'median': statistics.median(runs), 'runs': runs}, result
+
+
+def bench_scale(scale, repeat, workdir):
+    league_dir = os.path.join(workdir, scale['label'])
+    started = time.perf_counter()
+    paths = synth_league.generate_league(league_dir, teams=scale['teams'], seasons=scale['seasons'],
+                                         bench=scale['bench'])
+    generate_seconds = time.perf_counter() - started
+
+    fantasy_dir = paths['fantasy_dir']
+    stages = {}
+
+    def parse():
+        contents = []
+        for filename in sorted(os.listdir(fantasy_dir)):
+            with open(os.path.join(fantasy_dir, filename), 'r', encoding='utf-8') as f:
+                contents.append(json.load(f))
+        return contents
+
+    stages['parse'], contents = _time(parse, repeat)
+    stages['model'], seasons = _time(lambda: list(league_model.load_seasons(fantasy_dir)), repeat)
+
+    def encode():
+        return sum(len(compact_schema.dumps_compact(compact_schema.encode_season(content)).encode('utf-8'))
+                   for content in contents)
+
+    stages['encode'], compact_bytes = _time(encode, repeat)
+    stages['stats'], _ = _time(lambda: league_stats.compute_all_time_stats(seasons), repeat)
+    stages['careers'], _ = _time(lambda: player_careers.build_career_index(
+        league_model.load_seasons(fantasy_dir, rosters=True)), repeat)
+    stages['reconcile'], _ = _time(lambda: reconcile.reconcile(
+        league_model.load_seasons(fantasy_dir, rosters=True)), repeat)
+    stages['rollups'], _ = _time(lambda: rollups.compute_rollups(
+        league_model.load_seasons(fantasy_dir, rosters=True)), repeat)
+
+    db_path = os.path.join(league_dir, 'history.db')
+
+    def build_db():
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        return history_db.build(db_path, fantasy_dir=fantasy_dir, draft_dir=paths['draft_dir'],
+                                player_map_path=os.path.join(league_dir, 'missing-player-map.js'))
+
+    stages['history-db'], _ = _time(build_db, repeat)
+
+    with open(paths['sleeper_players'], 'r', encoding='utf-8') as f:
+        sleeper = json.load(f)
+    stages['map'], (mapped, _) = _time(lambda: generate_sleeper_map.build_map_js(sleeper), repeat)
+
+    with local_rtdb_stub() as stub:
+        url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+        def upload():
+            with contextlib.redirect_stdout(io.StringIO()):
+                upload_data_simple.upload_all(league_dir, url)
+
+        stages['upload'], _ = _time(upload, repeat)
+        upload_requests = stub.requests // repeat
+        upload_bytes = stub.bytes_received // repeat
+
+    return {
+        'scale': scale,
+        'generate_seconds': generate_seconds,
+        'sizes': {
+            'fantasy_bytes': _dir_bytes(fantasy_dir),
+            'draft_bytes': _dir_bytes(paths['draft_dir']),
+            'compact_bytes': compact_bytes,
+            'player_lines': sum(len(t.get('starters', [])) + len(t.get('bench', []))
+                                for c in contents for w in c['weeks'].values()
+                                for m in w['matchups'] for t in m.values()),
+            'mapped_players': len(mapped),
+            'upload_requests': upload_requests,
+            'upload_bytes': upload_bytes
+        },
+        'stages': stages
+    }
+
+
+def print_results(results):
+    for result in results:
+        sizes = result['sizes']
+        print(f"\n== {result['scale']['label']} ({sizes['player_lines']} player lines, "
+              f"{sizes['fantasy_bytes'] / 1e6:.1f} MB fantasy, {sizes['compact_bytes'] / 1e6:.1f} MB compact)")
+        for stage, timing in result['stages'].items():
+            print(f"  {stage:<12} {timing['min'] * 1000:10.1f} ms  (median {timing['median'] * 1000:.1f} ms)")
+
+
+def compare(results, baseline):
+    """Prints min-time ratios current/baseline for every stage present in both runs."""
+    base = {r['scale']['label']: r for r in baseline['results']}
+    print("\n--- Compared with baseline (current / baseline, min time) ---")
+    for result in results:
+        label = result['scale']['label']
+        if label not in base:
+            print(f"  {label}: not in baseline")
+            continue
+        for stage, timing in result['stages'].items():
+            before = base[label]['stages'].get(stage)
+            if not before:
+                continue
+            ratio = timing['min'] / before['min'] if before['min'] else float('inf')
+            flag = '  <-- slower' if ratio > 1.1 else ''
+            print(f"  {label:<8} {stage:<12} {before['min'] * 1000:9.1f} -> {timing['min'] * 1000:9.1f} ms"
+                  f"  x{ratio:.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Python data pipeline on synthetic leagues.")
+    parser.add_argument('--scale', action='append', type=parse_scale,
+                        help=f"TEAMSxSEASONS[xBENCH], repeatable (default: {' '.join(DEFAULT_SCALES)})")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="results file (default: build/bench/bench-<timestamp>.json)")
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    parser.add_argument('--keep', action='store_true', help="keep the generated leagues")
+    args = parser.parse_args()
+
+    scales = args.scale or [parse_scale(s) for s in DEFAULT_SCALES]
+    workdir = tempfile.mkdtemp(prefix='topina-bench-')
+    try:
+        results = []
+        for scale in scales:
+            print(f"Benchmarking {scale['label']}...")
+            results.append(bench_scale(scale, args.repeat, workdir))
+    finally:
+        if args.keep:
+            print(f"Generated leagues kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results
+    }
+
+    output = args.output or os.path.join(BENCH_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print_results(results)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
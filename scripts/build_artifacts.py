@@ -0,0 +1,560 @@
+import argparse
+import hashlib
+import json
+import os
+import io
+import re
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+import metrics
+import reconcile
+from compact_schema import encode_season
+from config import BUILD_DIR, DATABASE_URL, DRAFT_DIR, FANTASY_DIR, KEY_FILE, ROOT
+from league_model import load_season, season_of
+from league_stats import compute_all_time_stats, season_summary
+from player_careers import load_career_index
+from player_map import PLAYER_MAP_PATH, load_player_map
+from rollups import CUBE_PATH, SLICES, compute_rollups
+from schedule_luck import compute_schedule_luck
+
+# Dependency-tracked build of everything we publish to RTDB.
+#
+# Sources                        Derived artifacts (RTDB nodes)
+#   data/fantasy/*_<season>  ->  fantasy/fantasy_data_<season>   (compact shard)
+#                                history/<season>                 (standings + playoffs)
+#                                stats/all_time                   (all seasons)
+#                                stats/schedule_luck              (all seasons)
+#                                stats/rollups/<slice>            (all seasons)
+#                                players/index                    (all seasons)
+#                                players/careers/<player>         (all seasons)
+#                                players/leaders                  (all seasons)
+#   data/draft/*_<season>    ->  draft/draft_data_<season>
+#                                players/index, careers, leaders
+#   js/data/player-map.js    ->  players/index, careers, leaders
+#
+# The scripts an artifact is generated by are inputs too (compact_schema.py
+# for the fantasy shards, league_stats.py for history/ and stats/all_time,
+# ...), so a code change rebuilds what it affects.
+#
+# build/state.json remembers the input hashes of every artifact and the hash of
+# what was last published, so a run only rebuilds artifacts whose inputs
+# changed and only uploads payloads that actually differ. Nodes that are no
+# longer produced are deleted: locally from the state, and with --since (CI,
+# where there is no state) by planning the data of <rev> and comparing
+# (plan_at()); that also rebuilds aggregates when a source file is removed.
+#
+# A complete --since run that published everything it had to records HEAD in
+# meta/deployed_rev; `--since deployed` diffs against that revision (a full
+# rebuild when none is recorded), so nodes whose upload failed, or a push the
+# reconcile gate blocked, are picked up again by the next run. Any failed
+# publish makes the run exit non-zero.
+#
+# Every run first reconciles the fantasy data (reconcile.py); any error-level
+# anomaly (score mismatch, duplicate matchup, ...) blocks the publish and the
+# report is left in build/reconcile.json. --skip-reconcile bypasses the gate.
+#
+#   python scripts/build_artifacts.py                  # one-shot, state-based
+#   python scripts/build_artifacts.py --watch          # rebuild on file changes
+#   python scripts/build_artifacts.py --since <rev>    # files changed since rev
+#   python scripts/build_artifacts.py --since deployed # CI: since meta/deployed_rev
+#   python scripts/build_artifacts.py --publisher files --out build/publish
+
+STATE_PATH = os.path.join(BUILD_DIR, 'state.json')
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PUBLISH_DIR = os.path.join(BUILD_DIR, 'publish')
+DEPLOYED_NODE = 'meta/deployed_rev'
+CAREER_KEYS_PATH = os.path.join(BUILD_DIR, 'career_keys.json')
+CAREER_KEYS_KEEP = 4
+
+
+class Artifact:
+    __slots__ = ('node', 'inputs', 'build')
+
+    def __init__(self, node, inputs, build):
+        self.node = node
+        self.inputs = list(inputs)
+        self.build = build
+
+
+def _json_files(directory):
+    if not os.path.exists(directory):
+        return []
+    directory = os.path.abspath(directory)
+    return [os.path.join(directory, f) for f in sorted(os.listdir(directory)) if f.endswith('.json')]
+
+
+def _code(*modules):
+    """Source files of the given scripts/ modules, as artifact inputs."""
+    return [os.path.join(SCRIPTS_DIR, f"{module}.py") for module in modules]
+
+
+def _load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _payload_hash(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _career_keys(inputs, compute, path=CAREER_KEYS_PATH):
+    """Shard keys of the career index for these inputs; compute() runs on a cache miss.
+
+    Keyed on the content of the inputs (not their paths), so plan_at() on an
+    older revision with the same data hits too. The last few digests are kept.
+    """
+    digest = hashlib.sha1()
+    for input_path in inputs:
+        digest.update(f"{os.path.basename(input_path)}:{_sha1(input_path)}\n".encode('utf-8'))
+    digest = digest.hexdigest()
+
+    cache = _load_json(path) if os.path.exists(path) else {}
+    if digest in cache:
+        return cache[digest]
+    keys = compute()
+    cache = dict(list(cache.items())[-(CAREER_KEYS_KEEP - 1):])
+    cache[digest] = keys
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    return keys
+
+
+def _player_index(fantasy_files, draft_files, player_map_path):
+    ids = load_player_map(player_map_path) if os.path.exists(player_map_path) else {}
+    seasons = {}
+    for path in draft_files:
+        season = season_of(os.path.basename(path))
+        for picks in (_load_json(path).get('teams') or {}).values():
+            for pick in picks:
+                seasons.setdefault(pick.get('name', ''), set()).add(season)
+    for path in fantasy_files:
+        season = load_season(path, rosters=True)
+        for _, _, team, _ in season.team_weeks():
+            for line in team.starters + team.bench:
+                seasons.setdefault(line.name, set()).add(season.season)
+
+    seasons.pop('', None)
+    return {'players': [{'name': name, 'espn_id': ids.get(name, ''), 'seasons': sorted(s)}
+                        for name, s in sorted(seasons.items())]}
+
+
+def plan(fantasy_dir=FANTASY_DIR, draft_dir=DRAFT_DIR, player_map_path=PLAYER_MAP_PATH):
+    """Lists every artifact with the source files it is derived from."""
+    player_map_path = os.path.abspath(player_map_path)
+    fantasy_files = _json_files(fantasy_dir)
+    draft_files = _json_files(draft_dir)
+    artifacts = []
+
+    for path in fantasy_files:
+        key = os.path.splitext(os.path.basename(path))[0]
+        season = season_of(os.path.basename(path))
+        artifacts.append(Artifact(f"fantasy/{key}", [path] + _code('compact_schema'),
+                                  lambda p=path: encode_season(_load_json(p))))
+        artifacts.append(Artifact(f"history/{season}", [path] + _code('league_model', 'league_stats'),
+                                  lambda p=path: season_summary(load_season(p))))
+
+    for path in draft_files:
+        key = os.path.splitext(os.path.basename(path))[0]
+        artifacts.append(Artifact(f"draft/{key}", [path], lambda p=path: _load_json(p)))
+
+    if fantasy_files:
+        artifacts.append(Artifact('stats/all_time', fantasy_files + _code('league_model', 'league_stats'),
+                                  lambda: compute_all_time_stats(load_season(p) for p in fantasy_files)))
+        artifacts.append(Artifact('stats/schedule_luck', fantasy_files + _code('league_model', 'schedule_luck'),
+                                  lambda: compute_schedule_luck(load_season(p) for p in fantasy_files)))
+
+        # The slices come from one aggregation, done on first use; the cube
+        # itself only goes to build/rollups/cube.json.
+        rollups = {}
+
+        def rollup_node(name):
+            if not rollups:
+                rollups.update(compute_rollups((load_season(p, rosters=True) for p in fantasy_files), CUBE_PATH))
+            return rollups[name]
+
+        rollup_inputs = fantasy_files + _code('league_model', 'rollups')
+        for name in SLICES:
+            artifacts.append(Artifact(f"stats/rollups/{name}", rollup_inputs, lambda name=name: rollup_node(name)))
+
+        # The career index (one pass over every roster) is built on first use.
+        # The shard list depends on the data, so plan() needs the keys up
+        # front: they are cached on the hash of the index's inputs and only a
+        # miss builds the index here.
+        career_inputs = (fantasy_files + draft_files + ([player_map_path] if os.path.exists(player_map_path) else [])
+                         + _code('league_model', 'player_careers', 'player_map'))
+        careers = {}
+
+        def career_index():
+            if not careers:
+                careers['shards'], careers['leaders'] = load_career_index(fantasy_dir, draft_dir, player_map_path)
+            return careers
+
+        for key in _career_keys(career_inputs, lambda: sorted(career_index()['shards'])):
+            artifacts.append(Artifact(f"players/careers/{key}", career_inputs,
+                                      lambda key=key: career_index()['shards'][key]))
+        artifacts.append(Artifact('players/leaders', career_inputs, lambda: career_index()['leaders']))
+
+    index_inputs = fantasy_files + draft_files + ([player_map_path] if os.path.exists(player_map_path) else [])
+    if index_inputs:
+        artifacts.append(Artifact('players/index', index_inputs + _code('build_artifacts', 'player_map'),
+                                  lambda: _player_index(fantasy_files, draft_files, player_map_path)))
+    return artifacts
+
+
+# --- Publishers: callables (node, payload or None to delete) -> bool ---
+
+def rest_publisher(database_url=DATABASE_URL):
+    import upload_data_simple
+
+    def publish(node, payload):
+        return upload_data_simple.upload_to_firebase(node, payload, database_url)
+    return publish
+
+
+def _init_admin(database_url):
+    import firebase_admin
+    from firebase_admin import credentials
+
+    if not firebase_admin._apps:
+        account = os.environ.get('FIREBASE_SERVICE_ACCOUNT')
+        cred = credentials.Certificate(json.loads(account) if account else KEY_FILE)
+        firebase_admin.initialize_app(cred, {'databaseURL': database_url})
+
+
+def admin_publisher(database_url=DATABASE_URL):
+    """firebase_admin publisher; credentials from FIREBASE_SERVICE_ACCOUNT or config.KEY_FILE."""
+    from firebase_admin import db
+
+    _init_admin(database_url)
+
+    def publish(node, payload):
+        size = len(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+        metrics.count('bytes_serialized', size)
+        try:
+            with metrics.http_call('PUT', database_url) as call:
+                call.bytes_sent = size
+                if payload is None:
+                    db.reference(node).delete()
+                else:
+                    db.reference(node).set(payload)
+                call.status = 200
+            print(f"✓ Uploaded {node}")
+            return True
+        except Exception as e:
+            print(f"✗ Error uploading {node}: {e}")
+            return False
+    return publish
+
+
+def files_publisher(out_dir=PUBLISH_DIR):
+    def publish(node, payload):
+        path = os.path.join(out_dir, *node.split('/')) + '.json'
+        if payload is None:
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, separators=(',', ':'), ensure_ascii=False)
+            metrics.count('bytes_serialized', os.path.getsize(path))
+        print(f"[OK] {'Deleted' if payload is None else 'Wrote'} {node}")
+        return True
+    return publish
+
+
+# --- Readers: callables node -> value (None if missing), for meta/deployed_rev ---
+
+def rest_reader(database_url=DATABASE_URL):
+    import http_client
+
+    def read(node):
+        return http_client.client().get_json(f"{database_url}/{node}.json", cache=False)
+    return read
+
+
+def admin_reader(database_url=DATABASE_URL):
+    from firebase_admin import db
+
+    _init_admin(database_url)
+    return lambda node: db.reference(node).get()
+
+
+def files_reader(out_dir=PUBLISH_DIR):
+    def read(node):
+        path = os.path.join(out_dir, *node.split('/')) + '.json'
+        return _load_json(path) if os.path.exists(path) else None
+    return read
+
+
+# --- Build ---
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {'artifacts': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def build(artifacts, state, publish, changed=None, force=False, planned=None, before=None):
+    """Rebuilds and publishes artifacts whose inputs changed.
+
+    `changed` (a set of paths, e.g. from git) marks inputs dirty explicitly,
+    as does a different input list than last time (from `state`, or `before`:
+    {node: inputs} of the previous revision, see plan_at()); otherwise input
+    hashes are compared against `state`. Nodes in `state` or `before` that are
+    not `planned` (default: the artifacts' nodes) are deleted. Returns
+    (published nodes, nodes whose publish failed); `state` is updated in
+    place for successful uploads only.
+    """
+    hashes = {}
+    published = []
+    failed = []
+    previous = state.setdefault('artifacts', {})
+
+    for artifact in artifacts:
+        for path in artifact.inputs:
+            if path not in hashes:
+                hashes[path] = _sha1(path)
+        inputs = {path: hashes[path] for path in artifact.inputs}
+        entry = previous.get(artifact.node)
+
+        if force:
+            dirty = True
+        elif changed is not None:
+            known = set(entry['inputs']) if entry is not None else (before or {}).get(artifact.node)
+            dirty = bool(changed.intersection(artifact.inputs)) or (known is not None and known != set(inputs))
+        else:
+            dirty = entry is None or entry['inputs'] != inputs
+        if not dirty:
+            metrics.cache('artifacts', True)
+            continue
+        metrics.cache('artifacts', False)
+
+        with metrics.stage(artifact.node.split('/')[0]):
+            payload = artifact.build()
+        digest = _payload_hash(payload)
+
+        if entry is not None and entry.get('payload') == digest and not force:
+            # Inputs changed but the published result did not (e.g. formatting).
+            entry['inputs'] = inputs
+            continue
+
+        with metrics.stage('publish'):
+            ok = publish(artifact.node, payload)
+        if ok:
+            previous[artifact.node] = {'inputs': inputs, 'payload': digest}
+            published.append(artifact.node)
+        else:
+            failed.append(artifact.node)
+
+    # Artifacts whose sources disappeared (e.g. a removed season) are deleted.
+    current = set(planned) if planned is not None else {a.node for a in artifacts}
+    for node in sorted((set(previous) | set(before or ())) - current):
+        if publish(node, None):
+            previous.pop(node, None)
+            published.append(node)
+        else:
+            failed.append(node)
+
+    return published, failed
+
+
+def git_changed_files(rev):
+    """Paths changed between rev and HEAD, or None when rev is unknown (full build)."""
+    if not rev or set(rev) == {'0'}:
+        return None
+    try:
+        out = subprocess.run(['git', 'diff', '--name-only', rev, 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {os.path.normpath(os.path.join(ROOT, line)) for line in out.splitlines() if line}
+
+
+def plan_at(rev, changed, fantasy_dir=FANTASY_DIR, draft_dir=DRAFT_DIR, player_map_path=PLAYER_MAP_PATH):
+    """{node: inputs} the sources at `rev` produced, standing in for a state file.
+
+    The data files of `rev` are extracted from git and planned with the
+    current code (input paths mapped back into the working tree). Only done
+    when `changed` touches those sources; returns None otherwise.
+    """
+    sources = [os.path.abspath(p) for p in (fantasy_dir, draft_dir, player_map_path)]
+    if not any(path == source or path.startswith(source + os.sep) for path in changed for source in sources):
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        for source in sources:
+            relative = os.path.relpath(source, ROOT)
+            if relative.startswith('..'):
+                continue
+            try:
+                archive = subprocess.run(['git', 'archive', '--format=tar', rev, '--', relative],
+                                         cwd=ROOT, capture_output=True, check=True).stdout
+            except (OSError, subprocess.CalledProcessError):
+                continue    # not in that revision
+            with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+                tar.extractall(tmp, filter='data')
+        old = plan(*(os.path.join(tmp, os.path.relpath(source, ROOT)) for source in sources))
+        prefix = tmp + os.sep
+        return {a.node: {os.path.join(ROOT, p[len(prefix):]) if p.startswith(prefix) else p for p in a.inputs}
+                for a in old}
+
+
+def git_head():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def deployed_rev(read):
+    """The revision recorded by the last complete deploy, or None."""
+    try:
+        rev = read(DEPLOYED_NODE)
+    except Exception as e:
+        print(f"[ERROR] Could not read {DEPLOYED_NODE}: {e}")
+        return None
+    return rev if isinstance(rev, str) and rev else None
+
+
+def run_once(args, publish, read=None):
+    """One build. Returns True when the reconcile gate passed and every publish succeeded."""
+    if not args.skip_reconcile and not reconcile.gate(args.fantasy_dir):
+        return False
+    state = load_state(args.state)
+    since = args.since
+    if since == 'deployed':
+        since = deployed_rev(read) if read else None
+        print(f"Last deployed revision: {since or 'unknown'}")
+    changed = None
+    if args.since:
+        changed = git_changed_files(since)
+        if changed is None:
+            print(f"Cannot diff against {since!r}; rebuilding everything.")
+    planned = plan(args.fantasy_dir, args.draft_dir, args.player_map)
+    artifacts = [a for a in planned if not args.only or re.match(args.only, a.node)]
+    before = None
+    if changed is not None:
+        before = plan_at(since, changed, args.fantasy_dir, args.draft_dir, args.player_map)
+
+    started = time.perf_counter()
+    published, failed = build(artifacts, state, publish, changed=changed,
+                              force=args.force or (args.since is not None and changed is None),
+                              planned={a.node for a in planned}, before=before)
+    save_state(state, args.state)
+    print(f"{len(published)} of {len(artifacts)} artifact(s) published in "
+          f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    if failed:
+        print(f"[ERROR] {len(failed)} node(s) failed to publish: {', '.join(failed[:10])}"
+              + (' ...' if len(failed) > 10 else ''))
+        return False
+
+    # Everything up to HEAD is live: the next --since deployed run starts here.
+    head = git_head()
+    if args.since and not args.only and head:
+        if not publish(DEPLOYED_NODE, head):
+            return False
+    return True
+
+
+def _snapshot(args):
+    paths = _json_files(args.fantasy_dir) + _json_files(args.draft_dir)
+    if os.path.exists(args.player_map):
+        paths.append(args.player_map)
+    snapshot = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def _watch_build(args, publish):
+    # A half-saved file (or any other error) must not end the watcher: report
+    # it and wait for the next change.
+    try:
+        run_once(args, publish)
+    except Exception as e:
+        print(f"[ERROR] Build failed: {type(e).__name__}: {e}")
+        print("Waiting for the next change...")
+
+
+def watch(args, publish):
+    """Polls the sources and runs a build once changes have settled for --debounce seconds."""
+    print(f"Watching {args.fantasy_dir}, {args.draft_dir} and {args.player_map} (Ctrl+C to stop)...")
+    _watch_build(args, publish)
+    seen = _snapshot(args)
+    pending_since = None
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            now = _snapshot(args)
+            if now != seen:
+                seen = now
+                pending_since = time.monotonic()
+                continue
+            if pending_since is not None and time.monotonic() - pending_since >= args.debounce:
+                pending_since = None
+                print(f"\nChange detected at {time.strftime('%H:%M:%S')}, rebuilding...")
+                with metrics.stage('rebuild'):
+                    _watch_build(args, publish)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and publish derived RTDB artifacts.")
+    parser.add_argument('--watch', action='store_true', help="keep running and rebuild on changes")
+    parser.add_argument('--interval', type=float, default=1.0, help="watch polling interval (s)")
+    parser.add_argument('--debounce', type=float, default=2.0, help="quiet time before rebuilding (s)")
+    parser.add_argument('--since', help="only rebuild artifacts whose sources changed since this git rev, "
+                                        "or 'deployed' for the rev in meta/deployed_rev")
+    parser.add_argument('--force', action='store_true', help="rebuild and publish everything")
+    parser.add_argument('--only', help="regex on node names, e.g. '^stats/'")
+    parser.add_argument('--publisher', choices=['rest', 'admin', 'files'], default='rest')
+    parser.add_argument('--database-url', default=DATABASE_URL)
+    parser.add_argument('--out', default=PUBLISH_DIR, help="output directory for --publisher files")
+    parser.add_argument('--state', default=STATE_PATH)
+    parser.add_argument('--fantasy-dir', default=FANTASY_DIR)
+    parser.add_argument('--draft-dir', default=DRAFT_DIR)
+    parser.add_argument('--player-map', default=PLAYER_MAP_PATH)
+    parser.add_argument('--skip-reconcile', action='store_true', help="publish even if the data has anomalies")
+    args = parser.parse_args(argv)
+
+    if args.publisher == 'files':
+        publish, read = files_publisher(args.out), files_reader(args.out)
+    elif args.publisher == 'admin':
+        publish, read = admin_publisher(args.database_url), admin_reader(args.database_url)
+    else:
+        publish, read = rest_publisher(args.database_url), rest_reader(args.database_url)
+
+    if args.watch:
+        watch(args, publish)
+    elif not run_once(args, publish, read):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    with metrics.run('build_artifacts'):
+        main()
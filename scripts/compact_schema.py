@@ -0,0 +1,232 @@
+import json
+import os
+import re
+
+from config import FANTASY_DIR
+
+# Compact published format for data/fantasy/*.json
+#
+# The scraped files repeat every field as text on every player line
+# ("fantasy_points": "23.10", "status": "Win, 37-20", the same name / NFL team
+# every week). The compact format keeps exactly the same information:
+#
+#   {
+#     "schema": "compact-v1",
+#     "league_id": ..., "season": ..., "scraped_at": ...,
+#     "teams":   ["riccardo97com", "lasers", ...],            # manager table
+#     "players": [["J. Allen", "QB", "BUF"], ...],            # name, position_in_team, nfl_team
+#     "weeks": {
+#       "1": [ {"team1": TEAM, "team2": TEAM}, ... ]
+#     }
+#   }
+#
+#   TEAM = {"t": team index, "s": 143.38, "st": [LINE, ...], "bn": [LINE, ...]}
+#   LINE = [player index, points, opponent, result, team score, opponent score (, slot)]
+#
+# result is one of RESULT_CODES ("" when the status string was empty, e.g. on a
+# bye). A status that is not "<Win|Loss|Tie|CAN>, N-N" (a live or unplayed
+# in-season game, "Sun 1:00 PM", ...) is kept verbatim: result RAW_RESULT and
+# the raw text in place of the team score, with 0 as the opponent score. The slot is only written when it differs from the default: the player's
+# position for starters (so only flex starters carry "W/R") and "BN" for bench.
+# No nulls or empty containers are written, since RTDB drops them; the decoder
+# treats missing "st"/"bn" as empty lists.
+#
+# js/data/fantasy-schema.js decodes this back into the scraped shape on the client.
+
+COMPACT_SCHEMA = 'compact-v1'
+
+RESULT_CODES = {'Win': 'W', 'Loss': 'L', 'Tie': 'T', 'CAN': 'C'}
+RESULT_NAMES = {code: name for name, code in RESULT_CODES.items()}
+RAW_RESULT = '?'
+
+BENCH_SLOT = 'BN'
+
+STATUS_RE = re.compile(r"^(\w+), (\d+)-(\d+)$")
+
+# Checked by main(): live / unplayed / odd statuses seen during a season.
+UNRECOGNISED_SAMPLES = ['Sun 1:00 PM', 'In Progress, 7-3', 'Final, 24-17', 'PPD', 'Win, 07-3']
+
+
+def is_compact(content):
+    return isinstance(content, dict) and content.get('schema') == COMPACT_SCHEMA
+
+
+def _points(value):
+    """'23.10' -> 23.1 (kept as int when whole, e.g. '0.00' -> 0)."""
+    number = round(float(value or 0), 2)
+    return int(number) if number.is_integer() else number
+
+
+def _format_points(value):
+    return f"{float(value or 0):.2f}"
+
+
+def _encode_status(status):
+    if not status:
+        return '', 0, 0
+    match = STATUS_RE.match(status)
+    if not match or match.group(1) not in RESULT_CODES or decode_status(
+            RESULT_CODES[match.group(1)], int(match.group(2)), int(match.group(3))) != status:
+        return RAW_RESULT, status, 0
+    return RESULT_CODES[match.group(1)], int(match.group(2)), int(match.group(3))
+
+
+def decode_status(result, score_for, score_against):
+    if not result:
+        return ''
+    if result == RAW_RESULT:
+        return score_for
+    return f"{RESULT_NAMES[result]}, {score_for}-{score_against}"
+
+
+class _Table:
+    """Assigns stable integer ids to values in first-seen order."""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def id_for(self, value):
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+def _encode_line(player, players, default_slot):
+    pid = players.id_for((player.get('name', ''), player.get('position_in_team', ''), player.get('nfl_team', '')))
+    result, score_for, score_against = _encode_status(player.get('status', ''))
+    line = [pid, _points(player.get('fantasy_points')), player.get('opponent', ''), result, score_for, score_against]
+
+    slot = player.get('position', '')
+    if slot != (default_slot or player.get('position_in_team', '')):
+        line.append(slot)
+    return line
+
+
+def _encode_team(team, teams, players):
+    encoded = {'t': teams.id_for(team.get('name', '')), 's': _points(team.get('score'))}
+    starters = [_encode_line(p, players, None) for p in team.get('starters') or []]
+    bench = [_encode_line(p, players, BENCH_SLOT) for p in team.get('bench') or []]
+    if starters:
+        encoded['st'] = starters
+    if bench:
+        encoded['bn'] = bench
+    return encoded
+
+
+def encode_season(content):
+    """Encodes a scraped fantasy season into the compact published format."""
+    if is_compact(content):
+        return content
+
+    teams = _Table()
+    players = _Table()
+    weeks = {}
+
+    for week_num, week_data in (content.get('weeks') or {}).items():
+        matchups = []
+        for matchup in (week_data or {}).get('matchups') or []:
+            encoded = {}
+            for side in ('team1', 'team2'):
+                if matchup.get(side):
+                    encoded[side] = _encode_team(matchup[side], teams, players)
+            matchups.append(encoded)
+        weeks[week_num] = matchups
+
+    compact = {'schema': COMPACT_SCHEMA}
+    for key in ('league_id', 'season', 'scraped_at'):
+        if key in content:
+            compact[key] = content[key]
+    compact['teams'] = teams.values
+    compact['players'] = [list(p) for p in players.values]
+    compact['weeks'] = weeks
+    return compact
+
+
+def _decode_line(line, players, default_slot):
+    name, position_in_team, nfl_team = players[line[0]]
+    slot = line[6] if len(line) > 6 else (default_slot or position_in_team)
+    return {
+        'position': slot,
+        'name': name,
+        'position_in_team': position_in_team,
+        'nfl_team': nfl_team,
+        'opponent': line[2],
+        'status': decode_status(line[3], line[4], line[5]),
+        'fantasy_points': _format_points(line[1])
+    }
+
+
+def _decode_team(team, teams, players):
+    return {
+        'name': teams[team['t']],
+        'score': _format_points(team.get('s')),
+        'starters': [_decode_line(line, players, None) for line in team.get('st') or []],
+        'bench': [_decode_line(line, players, BENCH_SLOT) for line in team.get('bn') or []]
+    }
+
+
+def decode_season(compact):
+    """Expands a compact season back into the scraped fantasy_data_*.json shape."""
+    if not is_compact(compact):
+        return compact
+
+    teams = compact.get('teams') or []
+    players = compact.get('players') or []
+    content = {key: compact[key] for key in ('league_id', 'season', 'scraped_at') if key in compact}
+    content['weeks'] = {}
+
+    for week_num, matchups in (compact.get('weeks') or {}).items():
+        decoded = []
+        for matchup in matchups or []:
+            decoded.append({side: _decode_team(matchup[side], teams, players)
+                            for side in ('team1', 'team2') if matchup.get(side)})
+        content['weeks'][week_num] = {'matchups': decoded}
+    return content
+
+
+def dumps_compact(compact):
+    return json.dumps(compact, separators=(',', ':'), ensure_ascii=False)
+
+
+def main(fantasy_dir=FANTASY_DIR):
+    """Encodes every season, checks the round trip and reports the size savings."""
+    files = sorted(f for f in os.listdir(fantasy_dir) if f.endswith('.json'))
+
+    raw_total = 0
+    compact_total = 0
+    for filename in files:
+        with open(os.path.join(fantasy_dir, filename), 'r', encoding='utf-8') as f:
+            content = json.load(f)
+
+        compact = encode_season(content)
+        if decode_season(compact) != content:
+            print(f"[ERROR] {filename}: round trip does not reproduce the source file")
+            continue
+
+        raw_size = len(json.dumps(content, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+        compact_size = len(dumps_compact(compact).encode('utf-8'))
+        raw_total += raw_size
+        compact_total += compact_size
+        print(f"[OK] {filename}: {raw_size} -> {compact_size} bytes "
+              f"({len(compact['players'])} players, {compact_size / raw_size:.0%})")
+
+    if raw_total:
+        print(f"Total: {raw_total} -> {compact_total} bytes ({compact_total / raw_total:.0%})")
+
+    # In-season files can carry statuses the codes do not cover; they must survive as-is.
+    sample = {'season': '0000', 'weeks': {'1': {'matchups': [{'team1': {
+        'name': 'sample', 'score': '0.00', 'bench': [],
+        'starters': [{'position': 'QB', 'name': 'Sample', 'position_in_team': 'QB', 'nfl_team': 'BUF',
+                      'opponent': 'MIA', 'status': status, 'fantasy_points': '0.00'}
+                     for status in UNRECOGNISED_SAMPLES]}}]}}}
+    if decode_season(encode_season(sample)) == sample:
+        print(f"[OK] {len(UNRECOGNISED_SAMPLES)} unrecognised statuses kept verbatim")
+    else:
+        print("[ERROR] unrecognised statuses do not survive the round trip")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import os
+
+# Shared configuration for the pipeline scripts and the topina CLI.
+#
+# Every path is anchored at the repository root, so scripts behave the same
+# whichever directory they are started from. Keep this module dependency-free:
+# it is imported on the CLI's startup path.
+#
+# Environment:
+#   TOPINA_DATABASE_URL   Realtime Database to read from / publish to
+#   TOPINA_KEY_FILE       service account key for the firebase_admin uploader
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def repo_path(*parts):
+    return os.path.join(ROOT, *parts)
+
+
+DATABASE_URL = os.environ.get('TOPINA_DATABASE_URL', "https://topina-9cd75-default-rtdb.firebaseio.com").rstrip('/')
+KEY_FILE = os.environ.get('TOPINA_KEY_FILE', repo_path('serviceAccountKey.json'))
+
+DATA_DIR = repo_path('data')
+FANTASY_DIR = os.path.join(DATA_DIR, 'fantasy')
+DRAFT_DIR = os.path.join(DATA_DIR, 'draft')
+
+PLAYER_MAP_PATH = repo_path('js', 'data', 'player-map.js')
+SLEEPER_PLAYERS_PATH = repo_path('scripts', 'sleeper_players.json')
+GENERATED_MAP_PATH = repo_path('scripts', 'generated_map.js')
+VALIDATION_REPORT_PATH = repo_path('validation_report.json')
+
+BUILD_DIR = repo_path('build')
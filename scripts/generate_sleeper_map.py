@@ -1,5 +1,9 @@
+import argparse
 import json
 
+import metrics
+from config import GENERATED_MAP_PATH, SLEEPER_PLAYERS_PATH
+
 # List of missing players from our previous report
 # (I'll add more from the full list if I can, or just do ALL players in Sleeper?)
 # Strategy: Let's create a map for EVERYONE in Sleeper who has an ESPN ID.
@@ -10,10 +14,8 @@ import json
 # For now, let's generate a map of ALL players with ESPN IDs from Sleeper.
 # The client-side map might be big, but 5000 lines is fine for modern JS.
 
-def generate_map():
-    with open('scripts/sleeper_players.json', 'r') as f:
-        data = json.load(f)
-    
+def build_map_js(data):
+    """Returns (players, js_content) for a Sleeper players dump."""
     # Sort by name
     players = []
     for pid, p in data.items():
@@ -32,8 +34,6 @@ def generate_map():
     # Sort
     players.sort(key=lambda x: x[0])
     
-    print(f"Found {len(players)} players with ESPN IDs.")
-    
     # Generate JS content
     js_content = "/**\n * Player Name to ESPN ID Mapping\n * Generated from Sleeper Data\n */\n"
     js_content += "export const PLAYER_ID_MAP = {\n"
@@ -44,15 +44,58 @@ def generate_map():
         js_content += f"    '{safe_name}': '{espn_id}',\n"
         
     js_content += "};\n"
+    return players, js_content
+
+def generate_map(source=SLEEPER_PLAYERS_PATH, output=GENERATED_MAP_PATH):
+    with metrics.stage('load_sleeper'):
+        with open(source, 'r') as f:
+            raw = f.read()
+        metrics.count('bytes_read', len(raw))
+        data = json.loads(raw)
+
+    with metrics.stage('build_map'):
+        players, js_content = build_map_js(data)
+    print(f"Found {len(players)} players with ESPN IDs.")
     
     # We also need the other exports usually in that file (TEAM_ABBR_MAP, ESPN_TEAM_IDS)
     # I should read the existing file and append/replace the map.
     # But for now let's just output the map to a file so I can copy-paste or merge it.
     
-    with open('scripts/generated_map.js', 'w') as f:
+    with metrics.stage('write'), open(output, 'w') as f:
         f.write(js_content)
+    metrics.count('bytes_written', len(js_content))
         
-    print("Generated map saved to scripts/generated_map.js")
+    print(f"Generated map saved to {output}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the player name -> ESPN id map from a Sleeper dump.")
+    parser.add_argument('--source', default=SLEEPER_PLAYERS_PATH, help="Sleeper players JSON dump")
+    parser.add_argument('--fetch', action='store_true',
+                        help="download the dump to --source first (through the shared HTTP cache)")
+    parser.add_argument('--output', default=GENERATED_MAP_PATH, help="generated JS map")
+    parser.add_argument('--merge', action='store_true',
+                        help="also merge the result into js/data/player-map.js and restore manual entries")
+    args = parser.parse_args(argv)
+
+    if args.fetch:
+        import http_client
+
+        with metrics.stage('fetch'):
+            players = http_client.sleeper_players()
+        with open(args.source, 'w') as f:
+            json.dump(players, f)
+        print(f"Saved {len(players)} Sleeper players to {args.source}")
+
+    generate_map(args.source, args.output)
+    if args.merge:
+        from merge_maps import merge_maps
+        from restore_manual_entries import restore_entries
+
+        with metrics.stage('merge'):
+            merge_maps(args.output)
+        with metrics.stage('restore'):
+            restore_entries()
 
 if __name__ == "__main__":
-    generate_map()
+    with metrics.run('generate_sleeper_map'):
+        main()
@@ -0,0 +1,474 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from compact_schema import decode_season
+from config import BUILD_DIR, DRAFT_DIR, FANTASY_DIR
+from league_model import season_config, week_phase
+from player_map import PLAYER_MAP_PATH, load_player_map
+
+# Indexed SQLite store over the league history.
+#
+#   python scripts/history_db.py build            # (re)load only changed files
+#   python scripts/history_db.py h2h lasers FedCom --playoffs
+#   python scripts/history_db.py player "Derrick Henry" --min-points 30
+#   python scripts/history_db.py sql "SELECT ..."
+#
+# The database is a build artifact (build/ is gitignored). Every source file is
+# recorded with its content hash, so `build` only reloads the seasons, drafts or
+# player map that actually changed since the last run.
+
+DB_PATH = os.path.join(BUILD_DIR, 'history.db')
+
+SCHEMA_VERSION = 3   # 2: source_files.path is absolute (config.py paths)
+                     # 3: rebuild databases emptied by the rename-then-remove bug
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS source_files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    season INTEGER,
+    sha1 TEXT NOT NULL,
+    loaded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS managers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS seasons (
+    season INTEGER PRIMARY KEY,
+    league_id TEXT,
+    scraped_at TEXT,
+    regular_season_weeks INTEGER NOT NULL,
+    playoff_week INTEGER NOT NULL,
+    super_bowl_week INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS team_weeks (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    matchup INTEGER NOT NULL,
+    phase TEXT NOT NULL,
+    manager_id INTEGER NOT NULL REFERENCES managers(id),
+    opponent_id INTEGER REFERENCES managers(id),
+    score REAL NOT NULL,
+    opponent_score REAL,
+    result TEXT,
+    PRIMARY KEY (season, week, manager_id)
+);
+CREATE TABLE IF NOT EXISTS player_weeks (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    manager_id INTEGER NOT NULL REFERENCES managers(id),
+    player TEXT NOT NULL COLLATE NOCASE,
+    position TEXT,
+    slot TEXT,
+    started INTEGER NOT NULL,
+    nfl_team TEXT,
+    opponent TEXT,
+    status TEXT,
+    points REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS draft_picks (
+    season INTEGER NOT NULL,
+    manager_id INTEGER NOT NULL REFERENCES managers(id),
+    pick INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    player TEXT NOT NULL COLLATE NOCASE,
+    position TEXT,
+    nfl_team TEXT,
+    PRIMARY KEY (season, pick)
+);
+CREATE TABLE IF NOT EXISTS player_ids (
+    player TEXT PRIMARY KEY COLLATE NOCASE,
+    espn_id TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_team_weeks_manager ON team_weeks (manager_id, season, week);
+CREATE INDEX IF NOT EXISTS idx_team_weeks_pair ON team_weeks (manager_id, opponent_id, phase);
+CREATE INDEX IF NOT EXISTS idx_player_weeks_season_week ON player_weeks (season, week);
+CREATE INDEX IF NOT EXISTS idx_player_weeks_manager ON player_weeks (manager_id, season);
+CREATE INDEX IF NOT EXISTS idx_player_weeks_player ON player_weeks (player);
+CREATE INDEX IF NOT EXISTS idx_player_weeks_nfl_team ON player_weeks (nfl_team, season);
+CREATE INDEX IF NOT EXISTS idx_draft_picks_manager ON draft_picks (manager_id, season);
+CREATE INDEX IF NOT EXISTS idx_draft_picks_player ON draft_picks (player);
+"""
+
+
+def _season_of(filename):
+    match = re.search(r"(\d{4})\.json$", filename)
+    return int(match.group(1)) if match else None
+
+
+def _sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def connect(db_path=DB_PATH):
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(SCHEMA)
+
+    row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+    if row is None:
+        with conn:
+            conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+    elif int(row['value']) != SCHEMA_VERSION:
+        # Layout changed since the file was built: start from scratch.
+        conn.close()
+        os.remove(db_path)
+        return connect(db_path)
+    return conn
+
+
+def _manager_id(conn, name, cache):
+    if name not in cache:
+        conn.execute("INSERT OR IGNORE INTO managers (name) VALUES (?)", (name,))
+        cache[name] = conn.execute("SELECT id FROM managers WHERE name = ?", (name,)).fetchone()['id']
+    return cache[name]
+
+
+def _result(score, opponent_score):
+    if opponent_score is None:
+        return None
+    if score > opponent_score:
+        return 'W'
+    if score < opponent_score:
+        return 'L'
+    return 'T'
+
+
+def load_fantasy_file(conn, path, managers):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = decode_season(json.load(f))
+
+    season = int(content.get('season') or _season_of(path))
+    config = season_config(season)
+    conn.execute("DELETE FROM team_weeks WHERE season = ?", (season,))
+    conn.execute("DELETE FROM player_weeks WHERE season = ?", (season,))
+    conn.execute(
+        "INSERT OR REPLACE INTO seasons VALUES (?, ?, ?, ?, ?, ?)",
+        (season, content.get('league_id'), content.get('scraped_at'),
+         config['regular_season_weeks'], config['playoff_week'], config['super_bowl_week'])
+    )
+
+    team_rows = []
+    player_rows = []
+    for week_num, week_data in (content.get('weeks') or {}).items():
+        week = int(week_num)
+        phase = week_phase(season, week)
+        for idx, matchup in enumerate((week_data or {}).get('matchups') or []):
+            sides = [matchup.get('team1'), matchup.get('team2')]
+            for team, opponent in (sides, sides[::-1]):
+                if not team:
+                    continue
+                manager_id = _manager_id(conn, team['name'], managers)
+                score = float(team.get('score') or 0)
+                opponent_id = _manager_id(conn, opponent['name'], managers) if opponent else None
+                opponent_score = float(opponent.get('score') or 0) if opponent else None
+                team_rows.append((season, week, idx, phase, manager_id, opponent_id,
+                                  score, opponent_score, _result(score, opponent_score)))
+
+                for started, lines in ((1, team.get('starters') or []), (0, team.get('bench') or [])):
+                    for p in lines:
+                        player_rows.append((
+                            season, week, manager_id, p.get('name', ''), p.get('position_in_team'),
+                            p.get('position'), started, p.get('nfl_team'), p.get('opponent'),
+                            p.get('status'), float(p.get('fantasy_points') or 0)
+                        ))
+
+    conn.executemany("INSERT OR REPLACE INTO team_weeks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", team_rows)
+    conn.executemany("INSERT INTO player_weeks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", player_rows)
+    return season
+
+
+def load_draft_file(conn, path, managers):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = json.load(f)
+
+    season = int(content.get('season') or _season_of(path))
+    conn.execute("DELETE FROM draft_picks WHERE season = ?", (season,))
+
+    teams = content.get('teams') or {}
+    league_size = len(teams) or 4
+    rows = []
+    for manager, picks in teams.items():
+        manager_id = _manager_id(conn, manager, managers)
+        for pick in picks:
+            number = int(pick['pick'])
+            rows.append((season, manager_id, number, -(-number // league_size),
+                         pick.get('name', ''), pick.get('position'), pick.get('nfl_team')))
+    conn.executemany("INSERT OR REPLACE INTO draft_picks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    return season
+
+
+def load_player_ids(conn, path):
+    conn.execute("DELETE FROM player_ids")
+    conn.executemany("INSERT OR REPLACE INTO player_ids VALUES (?, ?)", load_player_map(path).items())
+
+
+def _sources(fantasy_dir, draft_dir, player_map_path):
+    for directory, kind in ((fantasy_dir, 'fantasy'), (draft_dir, 'draft')):
+        if os.path.exists(directory):
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith('.json'):
+                    yield os.path.join(directory, filename), kind
+    if os.path.exists(player_map_path):
+        yield player_map_path, 'player_map'
+
+
+def build(db_path=DB_PATH, force=False, fantasy_dir=FANTASY_DIR, draft_dir=DRAFT_DIR,
+          player_map_path=PLAYER_MAP_PATH):
+    """Loads new or changed source files into the database. Returns the reloaded paths."""
+    conn = connect(db_path)
+    loaded = {row['path']: row['sha1'] for row in conn.execute("SELECT path, sha1 FROM source_files")}
+    managers = {}
+    changed = []
+
+    with conn:
+        sources = list(_sources(fantasy_dir, draft_dir, player_map_path))
+        present = {path for path, _ in sources}
+
+        # Files removed from data/ take their rows with them. Done before the
+        # loads: rows are deleted by season, so a renamed or replaced file
+        # would otherwise lose the season it has just loaded.
+        for path in set(loaded) - present:
+            row = conn.execute("SELECT kind, season FROM source_files WHERE path = ?", (path,)).fetchone()
+            if row['kind'] == 'fantasy':
+                conn.execute("DELETE FROM team_weeks WHERE season = ?", (row['season'],))
+                conn.execute("DELETE FROM player_weeks WHERE season = ?", (row['season'],))
+                conn.execute("DELETE FROM seasons WHERE season = ?", (row['season'],))
+            elif row['kind'] == 'draft':
+                conn.execute("DELETE FROM draft_picks WHERE season = ?", (row['season'],))
+            else:
+                conn.execute("DELETE FROM player_ids")
+            conn.execute("DELETE FROM source_files WHERE path = ?", (path,))
+            changed.append(path)
+
+        for path, kind in sources:
+            digest = _sha1(path)
+            if not force and loaded.get(path) == digest:
+                continue
+
+            if kind == 'fantasy':
+                season = load_fantasy_file(conn, path, managers)
+            elif kind == 'draft':
+                season = load_draft_file(conn, path, managers)
+            else:
+                season = None
+                load_player_ids(conn, path)
+
+            conn.execute("INSERT OR REPLACE INTO source_files VALUES (?, ?, ?, ?, ?)",
+                         (path, kind, season, digest, time.time()))
+            changed.append(path)
+
+    if changed:
+        conn.execute("ANALYZE")
+    conn.close()
+    return changed
+
+
+# --- Canned reports ---
+
+def _player_aliases(name):
+    """'Derrick Henry' -> ['Derrick Henry', 'D. Henry'] (recent seasons use the short form)."""
+    aliases = [name]
+    parts = name.split(' ', 1)
+    if len(parts) == 2 and not parts[0].endswith('.'):
+        aliases.append(f"{parts[0][0]}. {parts[1]}")
+    return aliases
+
+
+def report_h2h(conn, manager, opponent, playoffs=False):
+    phase_filter = "AND t.phase != 'regular'" if playoffs else ""
+    return conn.execute(f"""
+        SELECT t.season, t.week, t.phase, m.name AS manager, t.score,
+               o.name AS opponent, t.opponent_score, t.result
+        FROM team_weeks t
+        JOIN managers m ON m.id = t.manager_id
+        JOIN managers o ON o.id = t.opponent_id
+        WHERE m.name = ? AND o.name = ? {phase_filter}
+        ORDER BY t.season, t.week
+    """, (manager, opponent)).fetchall()
+
+
+def report_player(conn, player, min_points=None, manager=None, started_only=False):
+    aliases = _player_aliases(player)
+    sql = f"""
+        SELECT p.season, p.week, m.name AS manager, p.player, p.slot, p.nfl_team,
+               p.opponent, p.status, p.points
+        FROM player_weeks p
+        JOIN managers m ON m.id = p.manager_id
+        WHERE p.player IN ({', '.join('?' for _ in aliases)})
+    """
+    params = list(aliases)
+    if min_points is not None:
+        sql += " AND p.points >= ?"
+        params.append(min_points)
+    if manager:
+        sql += " AND m.name = ?"
+        params.append(manager)
+    if started_only:
+        sql += " AND p.started = 1"
+    return conn.execute(sql + " ORDER BY p.season, p.week", params).fetchall()
+
+
+def report_standings(conn, season):
+    return conn.execute("""
+        SELECT m.name AS manager,
+               SUM(t.result = 'W') AS w, SUM(t.result = 'L') AS l, SUM(t.result = 'T') AS t,
+               ROUND(SUM(t.score), 2) AS pf, ROUND(SUM(t.opponent_score), 2) AS pa
+        FROM team_weeks t
+        JOIN managers m ON m.id = t.manager_id
+        WHERE t.season = ? AND t.phase = 'regular'
+        GROUP BY m.name
+        ORDER BY w DESC, pf DESC
+    """, (season,)).fetchall()
+
+
+def report_top_scores(conn, limit=10, lowest=False):
+    order = "ASC" if lowest else "DESC"
+    return conn.execute(f"""
+        SELECT t.season, t.week, m.name AS manager, t.score, o.name AS opponent, t.opponent_score
+        FROM team_weeks t
+        JOIN managers m ON m.id = t.manager_id
+        LEFT JOIN managers o ON o.id = t.opponent_id
+        WHERE t.score > 0
+        ORDER BY t.score {order}
+        LIMIT ?
+    """, (limit,)).fetchall()
+
+
+def report_nfl_teams(conn, manager, season=None):
+    sql = """
+        SELECT p.nfl_team, COUNT(*) AS starts, ROUND(SUM(p.points), 2) AS points
+        FROM player_weeks p
+        JOIN managers m ON m.id = p.manager_id
+        WHERE m.name = ? AND p.started = 1 AND p.nfl_team != ''
+    """
+    params = [manager]
+    if season:
+        sql += " AND p.season = ?"
+        params.append(season)
+    return conn.execute(sql + " GROUP BY p.nfl_team ORDER BY points DESC", params).fetchall()
+
+
+def report_drafted(conn, player):
+    aliases = _player_aliases(player)
+    return conn.execute(f"""
+        SELECT d.season, d.round, d.pick, m.name AS manager, d.player, d.position, d.nfl_team
+        FROM draft_picks d
+        JOIN managers m ON m.id = d.manager_id
+        WHERE d.player IN ({', '.join('?' for _ in aliases)})
+        ORDER BY d.season
+    """, aliases).fetchall()
+
+
+def print_rows(rows):
+    if not rows:
+        print("(no rows)")
+        return
+    headers = list(rows[0].keys())
+    cells = [[('' if v is None else str(v)) for v in row] for row in rows]
+    widths = [max(len(h), *(len(r[i]) for r in cells)) for i, h in enumerate(headers)]
+    print('  '.join(h.ljust(w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for r in cells:
+        print('  '.join(v.ljust(w) for v, w in zip(r, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Indexed query store over the Topina league history.")
+    parser.add_argument('--db', default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('build', help="load new or changed data files")
+    p.add_argument('--force', action='store_true', help="reload every file")
+
+    p = sub.add_parser('h2h', help="head-to-head games between two managers")
+    p.add_argument('manager')
+    p.add_argument('opponent')
+    p.add_argument('--playoffs', action='store_true', help="playoff and Super Bowl weeks only")
+
+    p = sub.add_parser('player', help="weekly lines for one player")
+    p.add_argument('player')
+    p.add_argument('--min-points', type=float)
+    p.add_argument('--manager')
+    p.add_argument('--started', action='store_true', help="starting lineup only")
+
+    p = sub.add_parser('standings', help="regular-season standings")
+    p.add_argument('season', type=int)
+
+    p = sub.add_parser('top-scores', help="highest (or lowest) team scores")
+    p.add_argument('--limit', type=int, default=10)
+    p.add_argument('--lowest', action='store_true')
+
+    p = sub.add_parser('nfl-teams', help="starter points by NFL team for a manager")
+    p.add_argument('manager')
+    p.add_argument('--season', type=int)
+
+    p = sub.add_parser('drafted', help="draft history of a player")
+    p.add_argument('player')
+
+    p = sub.add_parser('sql', help="run an ad-hoc query")
+    p.add_argument('query')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        changed = build(args.db, force=args.force)
+        elapsed = (time.perf_counter() - started) * 1000
+        for path in changed:
+            print(f"[OK] Loaded {path}")
+        print(f"{len(changed)} file(s) reloaded in {elapsed:.0f} ms -> {args.db}")
+        return
+
+    build(args.db)
+    conn = connect(args.db)
+    started = time.perf_counter()
+
+    if args.command == 'h2h':
+        rows = report_h2h(conn, args.manager, args.opponent, playoffs=args.playoffs)
+    elif args.command == 'player':
+        rows = report_player(conn, args.player, args.min_points, args.manager, args.started)
+    elif args.command == 'standings':
+        rows = report_standings(conn, args.season)
+    elif args.command == 'top-scores':
+        rows = report_top_scores(conn, args.limit, args.lowest)
+    elif args.command == 'nfl-teams':
+        rows = report_nfl_teams(conn, args.manager, args.season)
+    elif args.command == 'drafted':
+        rows = report_drafted(conn, args.player)
+    else:
+        try:
+            rows = conn.execute(args.query).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    elapsed = (time.perf_counter() - started) * 1000
+    print_rows(rows)
+    if args.command == 'h2h' and rows:
+        wins = sum(r['result'] == 'W' for r in rows)
+        losses = sum(r['result'] == 'L' for r in rows)
+        print(f"\n{args.manager} vs {args.opponent}: {wins}-{losses}-{len(rows) - wins - losses}")
+    print(f"\n{len(rows)} row(s) in {elapsed:.1f} ms")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
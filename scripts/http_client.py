@@ -0,0 +1,433 @@
+import argparse
+import http.client
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlencode, urljoin, urlsplit
+
+import metrics
+from config import BUILD_DIR
+
+# Shared HTTP client for the ESPN / Sleeper / RTDB reads. RTDB writes
+# (upload_data_simple.upload_to_firebase) stay on urllib: nothing there is
+# cacheable and the client has no request bodies.
+#
+#   items = http_client.espn_search('Drake Maye')
+#   found = http_client.espn_search_many(names)          # batch, coalesced
+#
+# - keep-alive connections are pooled per host (stdlib http.client, so the
+#   scripts no longer need `requests`) and every request has a timeout
+# - identical requests in flight at the same time share one network call
+# - responses are recorded in build/http_cache.db (SQLite) and replayed until
+#   they expire: hits after TTL, misses (404s, empty searches) after the much
+#   shorter NEGATIVE_TTL so new players show up; 5xx responses are not stored
+# - requests to the same host are spaced by MIN_INTERVAL seconds
+# - cache=False reads live data that must not be replayed (e.g. the current
+#   RTDB draft); it still shares the pool, coalescing and throttling
+#
+# Modes (TOPINA_HTTP_MODE or HttpClient(mode=...)):
+#   cache    replay fresh entries, fetch and record the rest (default)
+#   refresh  always fetch, record the result
+#   replay   offline: only the cache, any age; a miss raises CacheMiss
+#   off      no cache at all
+#
+#   python scripts/http_client.py stats | prune | clear
+#   python scripts/http_client.py search "Drake Maye" [--offline]
+
+CACHE_PATH = os.path.join(BUILD_DIR, 'http_cache.db')
+MODES = ('cache', 'refresh', 'replay', 'off')
+DEFAULT_TTL = 7 * 24 * 3600
+NEGATIVE_TTL = 24 * 3600
+TIMEOUT = 10
+MIN_INTERVAL = 0.05
+WORKERS = 4
+USER_AGENT = 'Mozilla/5.0'
+
+ESPN_SEARCH_URL = "https://site.api.espn.com/apis/common/v3/search"
+ESPN_HEADSHOT_URL = "https://a.espncdn.com/combiner/i?img=/i/headshots/nfl/players/full/{}.png&w=350&h=254&scale=crop"
+SLEEPER_PLAYERS_URL = "https://api.sleeper.app/v1/players/nfl"
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a request has never been recorded."""
+
+
+class Response:
+    __slots__ = ('url', 'status', 'body', 'fetched_at', 'from_cache')
+
+    def __init__(self, url, status, body, fetched_at, from_cache=False):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.fetched_at = fetched_at
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def json(self):
+        return json.loads(self.body.decode('utf-8')) if self.body else None
+
+    def __repr__(self):
+        return f"Response({self.status}, {self.url!r}{', cached' if self.from_cache else ''})"
+
+
+def build_url(url, params=None):
+    """Appends params (None values dropped) in sorted order, so equal queries share a cache key."""
+    if not params:
+        return url
+    query = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+    return f"{url}{'&' if '?' in url else '?'}{query}" if query else url
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port)."""
+
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, scheme, host, port):
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout)
+
+    def request(self, method, url, headers):
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        reused = conn is not None
+        if conn is None:
+            conn = self._connect(*key)
+
+        try:
+            conn.request(method, path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry on a new one.
+            conn = self._connect(*key)
+            conn.request(method, path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+
+        if resp.will_close:
+            conn.close()
+        else:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.size:
+                    idle.append(conn)
+                else:
+                    conn.close()
+        return resp.status, resp.getheader('Location'), body
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+class HttpClient:
+    def __init__(self, cache_path=CACHE_PATH, mode=None, ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL,
+                 timeout=TIMEOUT, min_interval=MIN_INTERVAL, workers=WORKERS):
+        self.mode = mode or os.environ.get('TOPINA_HTTP_MODE', 'cache')
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown HTTP mode {self.mode!r} (expected one of {', '.join(MODES)})")
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.min_interval = min_interval
+        self.workers = workers
+        self._pool = _ConnectionPool(workers, timeout)
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._next_slot = {}
+        self._db = None
+        if self.mode != 'off':
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(cache_path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    body BLOB,
+                    fetched_at REAL NOT NULL,
+                    negative INTEGER NOT NULL
+                )""")
+            self._db.commit()
+
+    # --- cache ---
+
+    def _load(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT status, body, fetched_at, negative FROM responses WHERE key = ?",
+                                   (key,)).fetchone()
+        return row
+
+    def _store(self, key, response, negative):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                             (key, response.status, response.body, response.fetched_at, int(negative)))
+            self._db.commit()
+
+    def _fresh(self, fetched_at, negative):
+        return time.time() - fetched_at < (self.negative_ttl if negative else self.ttl)
+
+    # --- network ---
+
+    def _throttle(self, url):
+        host = urlsplit(url).hostname
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            metrics.rate_limit_wait(slot - now)
+
+    def _fetch(self, method, url):
+        self._throttle(url)
+        headers = {'User-Agent': USER_AGENT, 'Accept': 'application/json, */*'}
+        for _ in range(4):
+            with metrics.http_call(method, url) as call:
+                status, location, body = self._pool.request(method, url, headers)
+                call.status = status
+                call.bytes_received = len(body)
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            break
+        return Response(url, status, body, time.time())
+
+    # --- public ---
+
+    def request(self, method, url, params=None, is_negative=None, cache=True):
+        """Returns a Response, from the cache when allowed; identical concurrent calls share one fetch.
+
+        is_negative(response) marks a 2xx answer as a miss (e.g. a search with
+        no items) so it expires after negative_ttl instead of ttl. cache=False
+        neither reads nor records the cache (in replay mode: CacheMiss).
+        """
+        url = build_url(url, params)
+        key = f"{method} {url}"
+        # A live read must not be handed the replayed body of a cached one.
+        flight = (key, cache)
+
+        with self._lock:
+            pending = self._inflight.get(flight)
+            if pending is None:
+                pending = self._inflight[flight] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            metrics.count('http_coalesced')
+            return pending.result()
+
+        try:
+            response = self._cached_or_fetch(method, url, key, is_negative, cache)
+            pending.set_result(response)
+            return response
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[flight]
+
+    def _cached_or_fetch(self, method, url, key, is_negative, cache):
+        cache = cache and self._db is not None
+        row = self._load(key) if cache else None
+        if row is not None and self.mode != 'refresh':
+            status, body, fetched_at, negative = row
+            if self.mode == 'replay' or self._fresh(fetched_at, negative):
+                metrics.cache('http', True)
+                return Response(url, status, body, fetched_at, from_cache=True)
+        if cache:
+            metrics.cache('http', False)
+        if self.mode == 'replay':
+            raise CacheMiss(f"{key} is not in the HTTP cache (offline replay mode)")
+
+        try:
+            response = self._fetch(method, url)
+        except (http.client.HTTPException, OSError):
+            if row is None:
+                raise
+            # Network trouble: an expired recording beats no answer.
+            metrics.count('http_stale')
+            status, body, fetched_at, _ = row
+            return Response(url, status, body, fetched_at, from_cache=True)
+
+        if cache and response.status < 500:
+            negative = not response.ok or bool(is_negative and is_negative(response))
+            self._store(key, response, negative)
+        return response
+
+    def get(self, url, params=None, is_negative=None, cache=True):
+        return self.request('GET', url, params, is_negative, cache)
+
+    def head(self, url, params=None):
+        return self.request('HEAD', url, params)
+
+    def get_json(self, url, params=None, is_negative=None, cache=True):
+        """Parsed JSON body, or None for a non-2xx answer."""
+        response = self.get(url, params, is_negative, cache)
+        return response.json() if response.ok else None
+
+    def map(self, fn, items):
+        """fn over items on the client's worker threads, results in input order."""
+        items = list(items)
+        if len(items) <= 1 or self.workers <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(fn, items))
+
+    # --- maintenance ---
+
+    def stats(self):
+        if self._db is None:
+            return {}
+        with self._lock:
+            rows = self._db.execute("SELECT negative, fetched_at FROM responses").fetchall()
+        fresh = sum(self._fresh(fetched_at, negative) for negative, fetched_at in rows)
+        return {'entries': len(rows), 'negative': sum(n for n, _ in rows), 'fresh': fresh,
+                'expired': len(rows) - fresh}
+
+    def prune(self):
+        """Drops expired entries. Returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute("DELETE FROM responses WHERE fetched_at < ? - CASE negative WHEN 1 THEN ? ELSE ? END",
+                                   (now, self.negative_ttl, self.ttl))
+            self._db.commit()
+        return cur.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        self._pool.close()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def client():
+    """The shared client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def configure(**kwargs):
+    """Replaces the shared client, e.g. configure(mode='replay')."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(**kwargs)
+        return _client
+
+
+# --- ESPN / Sleeper ---
+
+def _no_items(response):
+    try:
+        return not (response.json() or {}).get('items')
+    except ValueError:
+        return True
+
+
+def espn_search(name, limit=5, api=None, **params):
+    """ESPN player search results (list of items, possibly empty).
+
+    Extra params override the defaults; pass league=None to drop one.
+    """
+    query = {'limit': limit, 'type': 'player', 'sport': 'football', 'league': 'nfl', 'q': name}
+    query.update(params)
+    data = (api or client()).get_json(ESPN_SEARCH_URL, query, is_negative=_no_items)
+    return (data or {}).get('items') or []
+
+
+def espn_search_many(names, limit=5, api=None):
+    """{name: items} for many names, fetched concurrently."""
+    api = api or client()
+    names = list(dict.fromkeys(names))
+    return dict(zip(names, api.map(lambda name: espn_search(name, limit, api), names)))
+
+
+def headshot_url(espn_id):
+    return ESPN_HEADSHOT_URL.format(espn_id)
+
+
+def image_ok(url, api=None):
+    """True when the image URL answers 200 to a HEAD request (False offline if never recorded)."""
+    try:
+        return (api or client()).head(url).status == 200
+    except (CacheMiss, http.client.HTTPException, OSError):
+        return False
+
+
+def sleeper_players(api=None):
+    """Sleeper's full NFL players dump ({player_id: {...}}), recorded like any other response."""
+    api = api or client()
+    response = api.get(SLEEPER_PLAYERS_URL)
+    if not response.ok:
+        raise OSError(f"Sleeper players request failed: HTTP {response.status}")
+    return response.json()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared HTTP client cache for ESPN / Sleeper lookups.")
+    parser.add_argument('--offline', action='store_true', help="replay from the cache only")
+    parser.add_argument('--refresh', action='store_true', help="ignore cached answers")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help="cache size and freshness")
+    sub.add_parser('prune', help="drop expired entries")
+    sub.add_parser('clear', help="drop every entry")
+    p = sub.add_parser('search', help="ESPN player search")
+    p.add_argument('names', nargs='+')
+    args = parser.parse_args(argv)
+
+    api = configure(mode='replay' if args.offline else 'refresh' if args.refresh else None)
+    if args.command == 'stats':
+        for key, value in api.stats().items():
+            print(f"{key:<10} {value}")
+    elif args.command == 'prune':
+        print(f"Removed {api.prune()} expired entries")
+    elif args.command == 'clear':
+        api.clear()
+        print("Cache cleared")
+    else:
+        for name, items in espn_search_many(args.names, api=api).items():
+            print(f"{name}:")
+            for item in items:
+                print(f"  {item.get('displayName')} (ID: {item.get('id')})")
+            if not items:
+                print("  no results")
+    api.close()
+
+
+if __name__ == "__main__":
+    main()
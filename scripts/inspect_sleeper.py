@@ -1,14 +1,17 @@
 import json
 
-def check_sleeper_data():
+from config import SLEEPER_PLAYERS_PATH
+
+SAMPLES = ['Tom Brady', 'Julio Jones', 'Patrick Mahomes']
+
+def check_sleeper_data(samples=SAMPLES, path=SLEEPER_PLAYERS_PATH):
     try:
-        with open('scripts/sleeper_players.json', 'r') as f:
+        with open(path, 'r') as f:
             data = json.load(f)
         
         print(f"Loaded {len(data)} players from Sleeper.")
         
         # Check a few famous players to see fields
-        samples = ['Tom Brady', 'Julio Jones', 'Patrick Mahomes']
         found = 0
         
         for player_id, p_data in data.items():
@@ -24,4 +27,5 @@ def check_sleeper_data():
     except Exception as e:
         print(f"Error: {e}")
 
-check_sleeper_data()
+if __name__ == "__main__":
+    check_sleeper_data()
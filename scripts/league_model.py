@@ -0,0 +1,240 @@
+import json
+import os
+import sys
+from collections import namedtuple
+
+from compact_schema import BENCH_SLOT, decode_status, is_compact
+from config import FANTASY_DIR
+
+# Shared in-memory model of a fantasy season.
+#
+#   season = load_season('data/fantasy/fantasy_data_2024.json')            # scores only
+#   season = load_season(path, rosters=True)                               # + player lines
+#   for week, matchup, team, opponent in season.team_weeks(): ...
+#
+# Season / Week / Matchup / TeamWeek use __slots__ and PlayerLine is a plain
+# tuple, so a season costs a fraction of the nested dicts json.load builds.
+# With rosters=False (the default) player lines are dropped while parsing and
+# never retained; team, player and NFL-team strings are interned. For files in
+# the compact published format (compact_schema.py) the raw lines are kept and
+# only turned into PlayerLine records when .starters / .bench is first read.
+
+def season_config(season):
+    """Mirror of getSeasonConfig() in js/data.js: 2021 had an 18-week schedule."""
+    if str(season) == '2021':
+        return {'regular_season_weeks': 16, 'playoff_week': 17, 'super_bowl_week': 18}
+    return {'regular_season_weeks': 15, 'playoff_week': 16, 'super_bowl_week': 17}
+
+
+def week_phase(season, week):
+    config = season_config(season)
+    if week <= config['regular_season_weeks']:
+        return 'regular'
+    if week == config['super_bowl_week']:
+        return 'superbowl'
+    return 'playoff'
+
+
+def season_of(filename):
+    """fantasy_data_2024.json -> '2024'"""
+    return os.path.splitext(filename)[0].split('_')[2]
+
+
+PlayerLine = namedtuple('PlayerLine', 'slot name position nfl_team opponent status points')
+PlayerLine.__doc__ = """One roster line. slot is the lineup slot ('QB', 'W/R', 'BN', 'RES')."""
+
+_intern = sys.intern
+
+
+def _player_line(d):
+    return PlayerLine(
+        _intern(d.get('position', '')),
+        _intern(d.get('name', '')),
+        _intern(d.get('position_in_team', '')),
+        _intern(d.get('nfl_team', '')),
+        _intern(d.get('opponent', '')),
+        d.get('status', ''),
+        float(d.get('fantasy_points') or 0)
+    )
+
+
+class TeamWeek:
+    """One team's side of a matchup."""
+
+    __slots__ = ('name', 'score', '_starters', '_bench', '_raw', '_players')
+
+    def __init__(self, name, score, starters=None, bench=None, raw=None, players=None):
+        self.name = _intern(name)
+        self.score = score
+        self._starters = starters
+        self._bench = bench
+        self._raw = raw            # (starter rows, bench rows) in compact form
+        self._players = players    # compact player table for _raw
+
+    def _materialize(self):
+        if self._raw is None:
+            raise ValueError(f"Rosters were not loaded for {self.name}; use load_season(..., rosters=True)")
+        players = self._players
+        lines = []
+        for rows, default_slot in zip(self._raw, (None, BENCH_SLOT)):
+            decoded = []
+            for row in rows:
+                name, position, nfl_team = players[row[0]]
+                slot = row[6] if len(row) > 6 else (default_slot or position)
+                decoded.append(PlayerLine(slot, name, position, nfl_team, row[2], decode_status(row[3], row[4], row[5]),
+                                          float(row[1])))
+            lines.append(decoded)
+        self._starters, self._bench = lines
+        self._raw = self._players = None
+
+    @property
+    def starters(self):
+        if self._starters is None:
+            self._materialize()
+        return self._starters
+
+    @property
+    def bench(self):
+        if self._bench is None:
+            self._materialize()
+        return self._bench
+
+    @property
+    def has_rosters(self):
+        return self._starters is not None or self._raw is not None
+
+    def __repr__(self):
+        return f"TeamWeek({self.name!r}, {self.score})"
+
+
+class Matchup:
+    __slots__ = ('team1', 'team2')
+
+    def __init__(self, team1, team2):
+        self.team1 = team1
+        self.team2 = team2
+
+    def __iter__(self):
+        return iter((self.team1, self.team2))
+
+    def __repr__(self):
+        return f"Matchup({self.team1!r}, {self.team2!r})"
+
+
+class Week:
+    __slots__ = ('key', 'number', 'matchups')
+
+    def __init__(self, key, matchups):
+        self.key = key                 # the original "1".."18" key, as used in published stats
+        self.number = int(key)
+        self.matchups = matchups
+
+    def __repr__(self):
+        return f"Week({self.number}, {len(self.matchups)} matchups)"
+
+
+class Season:
+    __slots__ = ('season', 'league_id', 'scraped_at', 'weeks')
+
+    def __init__(self, season, league_id, scraped_at, weeks):
+        self.season = str(season)
+        self.league_id = league_id
+        self.scraped_at = scraped_at
+        self.weeks = weeks             # list of Week, in file order
+
+    def phase(self, week):
+        return week_phase(self.season, week.number if isinstance(week, Week) else int(week))
+
+    def team_weeks(self):
+        """Yields (week, matchup, team, opponent) for both sides of every matchup."""
+        for week in self.weeks:
+            for matchup in week.matchups:
+                if matchup.team1:
+                    yield week, matchup, matchup.team1, matchup.team2
+                if matchup.team2:
+                    yield week, matchup, matchup.team2, matchup.team1
+
+    def __repr__(self):
+        return f"Season({self.season}, {len(self.weeks)} weeks)"
+
+
+# --- Loading ---
+
+def _raw_hook(rosters):
+    def hook(d):
+        if 'fantasy_points' in d:
+            return _player_line(d) if rosters else None
+        return d
+    return hook
+
+
+def _lines(lines):
+    return [p if isinstance(p, PlayerLine) else _player_line(p) for p in lines or []]
+
+
+def _from_raw(content, rosters):
+    weeks = []
+    for key, week_data in (content.get('weeks') or {}).items():
+        matchups = []
+        for matchup in (week_data or {}).get('matchups') or []:
+            sides = []
+            for side in ('team1', 'team2'):
+                team = matchup.get(side)
+                if not team:
+                    sides.append(None)
+                    continue
+                sides.append(TeamWeek(
+                    team.get('name', ''), float(team.get('score') or 0),
+                    _lines(team.get('starters')) if rosters else None,
+                    _lines(team.get('bench')) if rosters else None
+                ))
+            matchups.append(Matchup(*sides))
+        weeks.append(Week(key, matchups))
+    return weeks
+
+
+def _from_compact(content, rosters):
+    teams = [_intern(t) for t in content.get('teams') or []]
+    players = [tuple(_intern(v) for v in p) for p in content.get('players') or []] if rosters else None
+    weeks = []
+    for key, matchups in (content.get('weeks') or {}).items():
+        decoded = []
+        for matchup in matchups or []:
+            sides = []
+            for side in ('team1', 'team2'):
+                team = matchup.get(side)
+                if not team:
+                    sides.append(None)
+                    continue
+                raw = (team.get('st') or [], team.get('bn') or []) if rosters else None
+                sides.append(TeamWeek(teams[team['t']], float(team.get('s') or 0), raw=raw, players=players))
+            decoded.append(Matchup(*sides))
+        weeks.append(Week(key, decoded))
+    return weeks
+
+
+def season_from_content(content, season=None, rosters=False):
+    """Builds a Season from an already parsed fantasy_data dict (raw or compact)."""
+    weeks = _from_compact(content, rosters) if is_compact(content) else _from_raw(content, rosters)
+    return Season(season or content.get('season', ''), content.get('league_id'), content.get('scraped_at'), weeks)
+
+
+def load_season(path, rosters=False):
+    """Loads one fantasy_data_*.json file (raw or compact) into a Season."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    season = season_of(os.path.basename(path))
+
+    if text.lstrip().startswith('{"schema"'):
+        return season_from_content(json.loads(text), season, rosters)
+
+    # Player lines become tuples (or are dropped) as soon as they are parsed.
+    return season_from_content(json.loads(text, object_hook=_raw_hook(rosters)), season, rosters)
+
+
+def load_seasons(fantasy_dir=FANTASY_DIR, rosters=False):
+    """Yields a Season for every fantasy_data_*.json in fantasy_dir, in season order."""
+    if not os.path.exists(fantasy_dir):
+        return
+    for filename in sorted(f for f in os.listdir(fantasy_dir) if f.endswith('.json')):
+        yield load_season(os.path.join(fantasy_dir, filename), rosters)
@@ -0,0 +1,126 @@
+from league_model import season_config
+
+# Season-level stats shared by the pipeline scripts (stats/all_time,
+# history/<season>). Both only need team scores, so they work on scores-only
+# league_model.Season objects:
+#
+#   compute_all_time_stats(load_seasons())
+
+
+def compute_all_time_stats(seasons):
+    """Builds the stats/all_time payload from league_model.Season objects."""
+    stats = {
+        'seasons_count': 0,
+        'total_games': 0,
+        'total_points': 0,
+        'highest_score': {'value': 0, 'team': '', 'week': '', 'season': ''},
+        'lowest_score': {'value': 1000, 'team': '', 'week': '', 'season': ''},
+        'largest_margin': {'value': 0, 'winner': '', 'loser': '', 'week': '', 'season': ''},
+        'most_points_season': {'value': 0, 'team': '', 'season': ''}
+    }
+
+    for season_obj in seasons:
+        season = season_obj.season
+        stats['seasons_count'] += 1
+        season_points = {}
+
+        for week in season_obj.weeks:
+            week_num = week.key
+            for matchup in week.matchups:
+                stats['total_games'] += 1
+
+                for team in matchup:
+                    if not team:
+                        continue
+
+                    score = team.score
+                    stats['total_points'] += score
+
+                    # High Score
+                    if score > stats['highest_score']['value']:
+                        stats['highest_score'] = {'value': score, 'team': team.name, 'week': week_num, 'season': season}
+
+                    # Low Score (ignore 0)
+                    if score > 0 and score < stats['lowest_score']['value']:
+                        stats['lowest_score'] = {'value': score, 'team': team.name, 'week': week_num, 'season': season}
+
+                    # Season Points
+                    season_points[team.name] = season_points.get(team.name, 0) + score
+
+                # Margin
+                t1, t2 = matchup.team1, matchup.team2
+                if t1 and t2:
+                    margin = abs(t1.score - t2.score)
+
+                    if margin > stats['largest_margin']['value']:
+                        winner, loser = (t1, t2) if t1.score > t2.score else (t2, t1)
+                        stats['largest_margin'] = {
+                            'value': round(margin, 2),
+                            'winner': winner.name,
+                            'loser': loser.name,
+                            'week': week_num,
+                            'season': season
+                        }
+
+        # Most Points in Season
+        for team, points in season_points.items():
+            if points > stats['most_points_season']['value']:
+                stats['most_points_season'] = {'value': round(points, 2), 'team': team, 'season': season}
+
+    stats['total_points'] = round(stats['total_points'], 2)
+    return stats
+
+
+def _result(s1, s2):
+    return 'W' if s1 > s2 else 'L' if s1 < s2 else 'T'
+
+
+def season_summary(season):
+    """Standings and playoff results for one league_model.Season (the history/<season> node).
+
+    Mirrors processStandings() / getSuperBowlMatchup() in js/data.js: standings
+    only count regular-season weeks, sorted by wins then points for.
+    """
+    config = season_config(season.season)
+    teams = {}
+    games = []
+
+    for week in season.weeks:
+        phase = season.phase(week)
+        for matchup in week.matchups:
+            t1, t2 = matchup.team1, matchup.team2
+            if not t1 or not t2:
+                continue
+
+            if phase != 'regular':
+                games.append({'week': week.number, 'phase': phase, 'team1': t1.name, 'score1': t1.score,
+                              'team2': t2.name, 'score2': t2.score})
+                continue
+
+            for name, pf, pa in ((t1.name, t1.score, t2.score), (t2.name, t2.score, t1.score)):
+                team = teams.setdefault(name, {'name': name, 'w': 0, 'l': 0, 't': 0, 'pf': 0.0, 'pa': 0.0})
+                team['pf'] += pf
+                team['pa'] += pa
+                team[_result(pf, pa).lower()] += 1
+
+    standings = sorted(teams.values(), key=lambda t: (-t['w'], -t['pf']))
+    for team in standings:
+        team['pf'] = round(team['pf'], 2)
+        team['pa'] = round(team['pa'], 2)
+
+    # Super Bowl: the SB-week game between the two playoff-week winners.
+    playoff_winners = {g['team1'] if g['score1'] >= g['score2'] else g['team2']
+                       for g in games if g['week'] == config['playoff_week']}
+    super_bowl = None
+    for g in games:
+        if g['week'] == config['super_bowl_week'] and {g['team1'], g['team2']} <= playoff_winners:
+            super_bowl = g
+            break
+    if super_bowl is None:
+        super_bowl = next((g for g in games if g['week'] == config['super_bowl_week']), None)
+
+    summary = {'season': season.season, 'standings': standings, 'playoffs': games}
+    if super_bowl:
+        summary['super_bowl'] = super_bowl
+        summary['champion'] = super_bowl['team1'] if super_bowl['score1'] >= super_bowl['score2'] else super_bowl['team2']
+    return summary
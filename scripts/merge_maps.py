@@ -1,9 +1,13 @@
 import os
 
-def merge_maps():
+import metrics
+from config import GENERATED_MAP_PATH, PLAYER_MAP_PATH
+
+def merge_maps(generated_path=GENERATED_MAP_PATH, map_path=PLAYER_MAP_PATH):
     # 1. Read the generated map (The Source of Truth for Players)
-    with open('scripts/generated_map.js', 'r') as f:
+    with open(generated_path, 'r') as f:
         gen_content = f.read()
+    metrics.count('bytes_read', len(gen_content))
     
     # Extract the PLAYER_ID_MAP object content
     # It starts with "export const PLAYER_ID_MAP = {" and ends with "};"
@@ -20,8 +24,9 @@ def merge_maps():
     new_player_map_content = gen_content[s_idx:e_idx+len(end_marker)]
 
     # 2. Read the existing map file (To keep TEAM_ABBR_MAP and ESPN_TEAM_IDS)
-    with open('js/data/player-map.js', 'r') as f:
+    with open(map_path, 'r') as f:
         old_content = f.read()
+    metrics.count('bytes_read', len(old_content))
     
     # We want to keep everything AFTER the PLAYER_ID_MAP in the old file
     # But wait, PLAYER_ID_MAP is usually first.
@@ -62,10 +67,12 @@ def merge_maps():
     final_content = header + final_content
     
     # Write back
-    with open('js/data/player-map.js', 'w') as f:
+    with metrics.stage('write'), open(map_path, 'w') as f:
         f.write(final_content)
+    metrics.count('bytes_written', len(final_content))
         
     print("Successfully merged maps!")
 
 if __name__ == "__main__":
-    merge_maps()
+    with metrics.run('merge_maps'), metrics.stage('merge'):
+        merge_maps()
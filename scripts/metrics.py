@@ -0,0 +1,249 @@
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config import BUILD_DIR
+
+# Lightweight run instrumentation for the pipeline scripts.
+#
+#   with metrics.run('upload_data_simple'):      # writes the JSON report on exit
+#       with metrics.stage('fantasy'):
+#           with metrics.http_call('PUT', url) as call:
+#               ...
+#               call.status = resp.status
+#           metrics.count('bytes_serialized', len(body))
+#
+# Environment:
+#   TOPINA_METRICS   report path, or "off" to skip writing it
+#                    (default: build/metrics/<run>-<timestamp>.json)
+#   TOPINA_PROFILE   comma-separated stage names to run under cProfile, or "*"
+#                    for every stage; .prof files are written to build/metrics/
+#
+# cProfile cannot nest, so only the outermost matching stage is profiled (an
+# inner matching stage shows up inside its profile). Repeated calls of a stage
+# accumulate into one profile, so its .prof covers every call, not the last.
+
+METRICS_DIR = os.path.join(BUILD_DIR, 'metrics')
+
+
+class HttpCall:
+    """Filled in by the caller inside metrics.http_call()."""
+
+    __slots__ = ('method', 'host', 'status', 'bytes_sent', 'bytes_received')
+
+    def __init__(self, method, host):
+        self.method = method
+        self.host = host
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class Metrics:
+    def __init__(self, name='run'):
+        self.name = name
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stack = threading.local()
+        self.stages = {}
+        self.counters = {}
+        self.http = {}
+        self.rate_limit = {'waits': 0, 'seconds': 0.0}
+        self.caches = {}
+        self.profiles = {}
+        self._profilers = {}
+        self._profiled_calls = {}
+        self._profiling = None    # stage that owns the active profiler
+        profile = os.environ.get('TOPINA_PROFILE', '')
+        self._profile = {s.strip() for s in profile.split(',') if s.strip()}
+
+    # --- stages ---
+
+    def _path(self):
+        stack = getattr(self._stack, 'names', None)
+        if stack is None:
+            stack = self._stack.names = []
+        return stack
+
+    def _should_profile(self, name):
+        return '*' in self._profile or name in self._profile
+
+    def _start_profile(self, full_name):
+        # One profiler per process: on 3.12+ a second enable() raises (even
+        # from another thread), before that the inner one silently takes over.
+        with self._lock:
+            if self._profiling is not None:
+                return None
+            self._profiling = full_name
+            profiler = self._profilers.get(full_name)
+            if profiler is None:
+                profiler = self._profilers[full_name] = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Times a block; nested stages are reported as 'outer/inner'."""
+        path = self._path()
+        path.append(name)
+        full_name = '/'.join(path)
+        started = time.perf_counter()
+        profiler = self._start_profile(full_name) if self._should_profile(name) else None
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                with self._lock:
+                    self._profiling = None
+                    self._profiled_calls[full_name] = self._profiled_calls.get(full_name, 0) + 1
+            elapsed = time.perf_counter() - started
+            path.pop()
+            with self._lock:
+                entry = self.stages.setdefault(full_name, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+                entry['calls'] += 1
+                entry['seconds'] += elapsed
+                entry['max_seconds'] = max(entry['max_seconds'], elapsed)
+            if profiler:
+                self._save_profile(full_name, profiler)
+
+    def _save_profile(self, full_name, profiler):
+        """Writes the profile accumulated over every call of the stage so far."""
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        safe = full_name.replace('/', '.').replace(' ', '_')
+        path = os.path.join(METRICS_DIR, f"{self.name}-{safe}.prof")
+        profiler.dump_stats(path)
+
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(10)
+        with self._lock:
+            self.profiles[full_name] = {'path': path, 'calls': self._profiled_calls[full_name],
+                                        'top': summary.getvalue().strip().splitlines()[-12:]}
+
+    # --- counters ---
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def cache(self, name, hit):
+        with self._lock:
+            entry = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+            entry['hits' if hit else 'misses'] += 1
+
+    def rate_limit_wait(self, seconds):
+        """Sleeps for a rate-limit pause and records it."""
+        time.sleep(seconds)
+        with self._lock:
+            self.rate_limit['waits'] += 1
+            self.rate_limit['seconds'] += seconds
+
+    @contextlib.contextmanager
+    def http_call(self, method, url):
+        call = HttpCall(method, urlsplit(url).hostname or url)
+        started = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            # urllib's HTTPError carries .code, requests' HTTPError a .response
+            response = getattr(e, 'response', None)
+            call.status = (call.status or getattr(e, 'code', None)
+                           or getattr(response, 'status_code', None) or type(e).__name__)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                host = self.http.setdefault(call.host, {
+                    'requests': 0, 'seconds': 0.0, 'bytes_sent': 0, 'bytes_received': 0,
+                    'methods': {}, 'status': {}
+                })
+                host['requests'] += 1
+                host['seconds'] += elapsed
+                host['bytes_sent'] += call.bytes_sent
+                host['bytes_received'] += call.bytes_received
+                host['methods'][method] = host['methods'].get(method, 0) + 1
+                status = str(call.status or 'unknown')
+                host['status'][status] = host['status'].get(status, 0) + 1
+                self.counters['bytes_sent'] = self.counters.get('bytes_sent', 0) + call.bytes_sent
+
+    # --- report ---
+
+    def report(self):
+        caches = {}
+        for name, entry in self.caches.items():
+            total = entry['hits'] + entry['misses']
+            caches[name] = dict(entry, hit_rate=round(entry['hits'] / total, 4) if total else None)
+
+        return {
+            'run': self.name,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'wall_seconds': round(time.perf_counter() - self._started, 6),
+            'stages': {name: {k: (round(v, 6) if isinstance(v, float) else v) for k, v in entry.items()}
+                       for name, entry in self.stages.items()},
+            'counters': self.counters,
+            'http': {host: dict(entry, seconds=round(entry['seconds'], 6)) for host, entry in self.http.items()},
+            'rate_limit': dict(self.rate_limit, seconds=round(self.rate_limit['seconds'], 6)),
+            'caches': caches,
+            'profiles': self.profiles
+        }
+
+    def write_report(self, path=None):
+        path = path or os.path.join(METRICS_DIR, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+_current = Metrics()
+
+
+def current():
+    return _current
+
+
+@contextlib.contextmanager
+def run(name):
+    """Starts a fresh metrics run and writes its report when the block exits."""
+    global _current
+    _current = Metrics(name)
+    try:
+        yield _current
+    finally:
+        target = os.environ.get('TOPINA_METRICS')
+        # Nothing recorded (e.g. the run stopped at --help): no report.
+        empty = not (_current.stages or _current.counters or _current.http)
+        if target != 'off' and not empty:
+            try:
+                path = _current.write_report(target or None)
+                print(f"Metrics report: {path}", file=sys.stderr)
+            except OSError as e:
+                print(f"Could not write metrics report: {e}", file=sys.stderr)
+
+
+def stage(name):
+    return _current.stage(name)
+
+
+def count(name, value=1):
+    _current.count(name, value)
+
+
+def cache(name, hit):
+    _current.cache(name, hit)
+
+
+def rate_limit_wait(seconds):
+    _current.rate_limit_wait(seconds)
+
+
+def http_call(method, url):
+    return _current.http_call(method, url)
@@ -0,0 +1,309 @@
+import argparse
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+
+from config import DRAFT_DIR, FANTASY_DIR
+from league_model import load_seasons, season_of
+from player_map import PLAYER_MAP_PATH, load_player_map
+
+# Per-player career index over every fantasy season.
+#
+#   players/careers/<key>   one shard per player (see career_shard())
+#   players/leaders         top-N leaderboards + the boom/bust thresholds used
+#
+# Every roster line of the whole history is visited once; lines are grouped
+# by (season, name, position) and the columns of each player are filled in
+# that same pass. Recent seasons list players as "D. Henry": each group is
+# resolved to the full name found in the drafts (or in older, unabbreviated
+# rosters) when exactly one candidate matches on initial, surname and
+# position, using the season's NFL team to break ties; failing that, to a
+# unique match among the player map's names.
+#
+# "Active" weeks are the ones a player could score in: not on a bye and not
+# parked in the RES slot. Consistency (stddev), averages and boom/bust rates
+# are computed over active weeks only. A boom is a week at or above the 80th
+# percentile of every active week at that position over the whole history, a
+# bust one at or below the 20th.
+#
+#   python scripts/player_careers.py "Derrick Henry"
+#   python scripts/player_careers.py --leaders
+
+TOP_N = 25
+TOP_WEEKS = 5
+MIN_ACTIVE_WEEKS = 10     # to qualify for the rate-based leaderboards
+BOOM_PERCENTILE = 0.8
+BUST_PERCENTILE = 0.2
+
+_ABBREVIATED = re.compile(r"^([A-Z])\. (.+)$")
+
+
+def player_key(name):
+    """RTDB-safe shard key: 'Amon-Ra St. Brown' -> 'amon-ra-st-brown'."""
+    return re.sub(r"[^a-z0-9]+", '-', name.lower()).strip('-') or 'unknown'
+
+
+# --- Name resolution ---
+
+def _load_drafts(draft_dir):
+    drafts = []
+    if not os.path.exists(draft_dir):
+        return drafts
+    for filename in sorted(f for f in os.listdir(draft_dir) if f.endswith('.json')):
+        with open(os.path.join(draft_dir, filename), 'r', encoding='utf-8') as f:
+            content = json.load(f)
+        season = str(content.get('season') or season_of(filename))
+        for picks in (content.get('teams') or {}).values():
+            for pick in picks or []:
+                drafts.append((season, pick.get('name', ''), pick.get('position', ''), pick.get('nfl_team', '')))
+    return drafts
+
+
+def _by_short_name(names):
+    by_short = defaultdict(list)
+    for name in names:
+        first, _, rest = name.partition(' ')
+        if rest and not _ABBREVIATED.match(name):
+            by_short[(first[0], rest)].append(name)
+    return by_short
+
+
+def _resolver(known, directory=()):
+    """known: full name -> set of (season, position, nfl_team). Returns resolve(group).
+
+    `directory` (e.g. the player map's names) is only consulted when no league
+    player matches, and only a unique match is taken from it.
+    """
+    by_short = _by_short_name(known)
+    fallback = _by_short_name(directory)
+
+    def resolve(season, name, position, teams):
+        match = _ABBREVIATED.match(name)
+        if not match:
+            return name
+        short = (match.group(1), match.group(2))
+        candidates = by_short.get(short)
+        if not candidates:
+            candidates = fallback.get(short, [])
+            return candidates[0] if len(candidates) == 1 else name
+        for keep in (lambda c: any(p == position for _, p, _ in known[c]),
+                     lambda c: any(s == season and t in teams for s, _, t in known[c]),
+                     lambda c: any(s == season for s, _, _ in known[c])):
+            if len(candidates) <= 1:
+                break
+            narrowed = [c for c in candidates if keep(c)]
+            candidates = narrowed or candidates
+        return candidates[0] if len(candidates) == 1 else name
+    return resolve
+
+
+# --- Index ---
+
+def _percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))]
+
+
+def _spread(points):
+    n = len(points)
+    if not n:
+        return 0.0, 0.0
+    mean = sum(points) / n
+    return mean, math.sqrt(sum((p - mean) ** 2 for p in points) / n)
+
+
+def _summary(rows, idx, thresholds, position):
+    """Totals and metrics over the given row indexes of a player's columns."""
+    points = [rows['points'][i] for i in idx]
+    started = [rows['started'][i] for i in idx]
+    active = [rows['points'][i] for i in idx if rows['active'][i]]
+    mean, stddev = _spread(active)
+    boom, bust = thresholds.get(position, (None, None))
+    summary = {
+        'weeks': len(idx),
+        'active_weeks': len(active),
+        'starts': sum(started),
+        'points': round(sum(points), 2),
+        'started_points': round(sum(p for p, s in zip(points, started) if s), 2),
+        'bench_points': round(sum(p for p, s in zip(points, started) if not s), 2),
+        'avg': round(mean, 2),
+        'stddev': round(stddev, 2)
+    }
+    if active and boom is not None:
+        summary['boom_rate'] = round(sum(p >= boom for p in active) / len(active), 3)
+        summary['bust_rate'] = round(sum(p <= bust for p in active) / len(active), 3)
+    return summary
+
+
+def build_career_index(seasons, drafts=(), directory=(), top_n=TOP_N):
+    """Returns (shards by key, leaders) for Season models loaded with rosters.
+
+    drafts are (season, name, position, nfl_team) tuples; directory is an
+    iterable of known full names (the player map) used to expand "D. Henry".
+    """
+    known = defaultdict(set)
+    for season, name, position, nfl_team in drafts:
+        if name and not _ABBREVIATED.match(name):
+            known[name].add((season, position, nfl_team))
+
+    # One pass over every roster line: columns per (season, raw name, position).
+    groups = {}
+    by_position = defaultdict(list)
+    for season in seasons:
+        for week, _, team, _ in season.team_weeks():
+            for lines, started in ((team.starters, True), (team.bench, False)):
+                for line in lines:
+                    if not line.name:
+                        continue
+                    active = line.opponent != 'Bye' and line.slot != 'RES'
+                    group = groups.get((season.season, line.name, line.position))
+                    if group is None:
+                        group = groups[(season.season, line.name, line.position)] = {
+                            'season': [], 'week': [], 'points': [], 'started': [], 'manager': [],
+                            'nfl_team': [], 'slot': [], 'active': []
+                        }
+                        if not _ABBREVIATED.match(line.name):
+                            known[line.name].add((season.season, line.position, line.nfl_team))
+                    group['season'].append(season.season)
+                    group['week'].append(week.number)
+                    group['points'].append(line.points)
+                    group['started'].append(started)
+                    group['manager'].append(team.name)
+                    group['nfl_team'].append(line.nfl_team)
+                    group['slot'].append(line.slot)
+                    group['active'].append(active)
+                    if active:
+                        by_position[line.position].append(line.points)
+
+    thresholds = {}
+    for position, points in by_position.items():
+        points.sort()
+        thresholds[position] = (_percentile(points, BOOM_PERCENTILE), _percentile(points, BUST_PERCENTILE))
+
+    # Merge the groups of each resolved player. A full name is one player even
+    # if the source lists them at another position some season; names that
+    # stay abbreviated are only merged within a position.
+    resolve = _resolver(known, directory)
+    players = {}
+    for (season, name, position), group in groups.items():
+        full_name = resolve(season, name, position, set(group['nfl_team']))
+        ident = (full_name, position if _ABBREVIATED.match(full_name) else '')
+        player = players.setdefault(ident, {'aliases': set(), 'groups': [], 'positions': Counter()})
+        player['aliases'].add(name)
+        player['groups'].append(group)
+        player['positions'][position] += len(group['week'])
+
+    shards = {}
+    for (name, _), player in sorted(players.items()):
+        position = player['positions'].most_common(1)[0][0]
+        key = player_key(name)
+        if key in shards:
+            key = f"{key}-{position.lower()}"
+        shards[key] = career_shard(key, name, position, player['aliases'], player['groups'], thresholds)
+
+    return shards, leaders(shards, thresholds, top_n)
+
+
+def career_shard(key, name, position, aliases, groups, thresholds):
+    merged = {column: [v for g in groups for v in g[column]] for column in groups[0]}
+    order = sorted(range(len(merged['week'])), key=lambda i: (merged['season'][i], merged['week'][i]))
+    columns = {column: [values[i] for i in order] for column, values in merged.items()}
+
+    all_rows = list(range(len(order)))
+    by_season = defaultdict(list)
+    for i, season in enumerate(columns['season']):
+        by_season[season].append(i)
+
+    seasons = []
+    for season, idx in sorted(by_season.items()):
+        entry = {'season': season}
+        entry.update(_summary(columns, idx, thresholds, position))
+        entry['manager'] = Counter(columns['manager'][i] for i in idx).most_common(1)[0][0]
+        entry['nfl_team'] = columns['nfl_team'][idx[-1]]
+        seasons.append(entry)
+
+    best = sorted(all_rows, key=lambda i: -columns['points'][i])[:TOP_WEEKS]
+    shard = {
+        'key': key,
+        'name': name,
+        'position': position,
+        'career': _summary(columns, all_rows, thresholds, position),
+        'seasons': seasons,
+        'top_weeks': [{'season': columns['season'][i], 'week': columns['week'][i],
+                       'points': columns['points'][i], 'started': columns['started'][i],
+                       'manager': columns['manager'][i]} for i in best],
+        'series': {column: values for column, values in columns.items() if column != 'active'}
+    }
+    others = sorted(aliases - {name})
+    if others:
+        shard['aliases'] = others
+    return shard
+
+
+def leaders(shards, thresholds, top_n=TOP_N):
+    """The players/leaders node: top_n entries per board."""
+    def board(value, qualified=lambda s: True, reverse=True):
+        rows = [(value(s), s) for s in shards.values() if qualified(s)]
+        rows.sort(key=lambda r: (-r[0] if reverse else r[0], r[1]['name']))
+        return [{'key': s['key'], 'name': s['name'], 'position': s['position'], 'value': v}
+                for v, s in rows[:top_n]]
+
+    def regular(s):
+        return s['career']['active_weeks'] >= MIN_ACTIVE_WEEKS
+
+    weeks = [dict(week, key=s['key'], name=s['name'], position=s['position'])
+             for s in shards.values() for week in s['top_weeks']]
+    weeks.sort(key=lambda w: (-w['points'], w['season'], w['week']))
+
+    return {
+        'top_n': top_n,
+        'min_active_weeks': MIN_ACTIVE_WEEKS,
+        'thresholds': {position: {'boom': boom, 'bust': bust} for position, (boom, bust) in sorted(thresholds.items())},
+        'boards': {
+            'started_points': board(lambda s: s['career']['started_points']),
+            'points': board(lambda s: s['career']['points']),
+            'avg': board(lambda s: s['career']['avg'], regular),
+            'consistency': board(lambda s: s['career']['stddev'], regular, reverse=False),
+            'boom_rate': board(lambda s: s['career'].get('boom_rate', 0), regular),
+            'bust_rate': board(lambda s: s['career'].get('bust_rate', 0), regular, reverse=False),
+            'best_weeks': weeks[:top_n]
+        }
+    }
+
+
+def load_career_index(fantasy_dir=FANTASY_DIR, draft_dir=DRAFT_DIR, player_map_path=PLAYER_MAP_PATH, top_n=TOP_N):
+    directory = load_player_map(player_map_path) if os.path.exists(player_map_path) else {}
+    return build_career_index(load_seasons(fantasy_dir, rosters=True), _load_drafts(draft_dir), directory, top_n)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-player career index over the league history.")
+    parser.add_argument('player', nargs='?', help="player name or shard key")
+    parser.add_argument('--leaders', action='store_true', help="print the leaderboards")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    shards, board = load_career_index(top_n=args.top)
+    print(f"{len(shards)} players indexed")
+
+    if args.player:
+        shard = shards.get(args.player) or shards.get(player_key(args.player))
+        if shard is None:
+            print(f"[ERROR] No player {args.player!r}")
+            return
+        print(json.dumps({k: v for k, v in shard.items() if k != 'series'}, indent=2))
+    if args.leaders or not args.player:
+        for name, rows in board['boards'].items():
+            print(f"\n{name}")
+            for row in rows:
+                value = row.get('value', row.get('points'))
+                extra = f"  {row['season']} wk {row['week']}" if 'week' in row else ''
+                print(f"  {row['name']:<24} {row['position']:<4} {value}{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import ast
+import os
+import re
+
+from config import PLAYER_MAP_PATH
+
+def load_player_map(path=PLAYER_MAP_PATH):
+    """Parses js/data/player-map.js to get the current manual mappings."""
+    if not os.path.exists(path):
+        print(f"Error: {path} not found.")
+        return {}
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    # Regex to extract the dictionary content inside PLAYER_ID_MAP = { ... };
+    match = re.search(r"export const PLAYER_ID_MAP = ({[\s\S]*?});", content)
+    if not match:
+        print("Error: Could not find PLAYER_ID_MAP in file.")
+        return {}
+    
+    js_obj = match.group(1)
+    
+    # Remove lines that are just comments or empty
+    lines = []
+    for line in js_obj.split('\n'):
+        # simple comment removal //...
+        clean_line = re.sub(r"//.*", "", line).strip()
+        if clean_line:
+            lines.append(clean_line)
+    
+    clean_js = "\n".join(lines)
+    # Remove trailing commas before closing braces (common in JS, invalid in Python/JSON)
+    clean_js = re.sub(r",\s*}", "}", clean_js)
+    
+    # Python dict syntax is very close to this JS object syntax (quoted keys and values)
+    # create a safe evaluation env
+    try:
+        data = ast.literal_eval(clean_js)
+        return data
+    except Exception as e:
+        print(f"Parsing failed with ast, falling back to regex extraction: {e}")
+        # manual extraction
+        manual_map = {}
+        for line in js_obj.split('\n'):
+            # Look for 'Name': 'ID'
+            m = re.search(r"['\"](.+?)['\"]\s*:\s*['\"](.+?)['\"]", line)
+            if m:
+                manual_map[m.group(1)] = m.group(2)
+        return manual_map
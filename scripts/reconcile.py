@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import time
+from collections import Counter, defaultdict
+
+import metrics
+from config import BUILD_DIR, FANTASY_DIR
+from league_model import load_seasons
+
+# Score reconciliation and anomaly checks for data/fantasy, run before uploads.
+#
+# One pass over every team-week fills flat columns (season, week, team,
+# reported score, summed starter points, ...) that the checks then scan:
+#
+#   score_mismatch     |sum of starters - reported score| > tolerance; only a
+#                      warning when a starter's game was cancelled ("CAN"),
+#                      since the league then scores that player separately
+#   zero_score         a team-week reporting 0 points
+#   empty_roster       a team-week without starters
+#   empty_week         a week without matchups
+#   duplicate_matchup  a team playing more than once in the same week
+#   duplicate_week     two weeks of a season with identical teams and scores
+#   duplicate_player   the same player (name + NFL team) twice in one week
+#
+# Errors block uploads (build_artifacts, upload_data*); warnings are only
+# reported. The JSON report goes to build/reconcile.json.
+#
+#   python scripts/reconcile.py [--strict] [--tolerance 0.01]
+
+SCHEMA = 'reconcile-v1'
+TOLERANCE = 0.01
+REPORT_PATH = os.path.join(BUILD_DIR, 'reconcile.json')
+
+
+def _columns(seasons):
+    cols = {'season': [], 'week': [], 'matchup': [], 'team': [], 'score': [], 'starter_sum': [],
+            'starters': [], 'cancelled': []}
+    weeks = []      # (season, week key, number of matchups, score signature)
+    players = []    # (season, week key, team, name, nfl_team)
+    for season in seasons:
+        for week in season.weeks:
+            signature = []
+            for m, matchup in enumerate(week.matchups):
+                for team in matchup:
+                    if not team:
+                        continue
+                    starters = team.starters
+                    cols['season'].append(season.season)
+                    cols['week'].append(week.key)
+                    cols['matchup'].append(m)
+                    cols['team'].append(team.name)
+                    cols['score'].append(team.score)
+                    cols['starter_sum'].append(round(sum(line.points for line in starters), 2))
+                    cols['starters'].append(len(starters))
+                    cols['cancelled'].append(any(line.status.startswith('CAN') for line in starters))
+                    signature.append((team.name, team.score))
+                    for line in starters + team.bench:
+                        players.append((season.season, week.key, team.name, line.name, line.nfl_team))
+            weeks.append((season.season, week.key, len(week.matchups), tuple(sorted(signature))))
+    return cols, weeks, players
+
+
+def _anomaly(kind, severity, season, week, detail, team=None, **extra):
+    anomaly = {'id': '/'.join(str(p) for p in (kind, season, week, team) if p is not None),
+               'kind': kind, 'severity': severity, 'season': season, 'week': week}
+    if team is not None:
+        anomaly['team'] = team
+    anomaly['detail'] = detail
+    anomaly.update(extra)
+    return anomaly
+
+
+def reconcile(seasons, tolerance=TOLERANCE, strict=False):
+    """Checks Season models (loaded with rosters) and returns the report dict."""
+    cols, weeks, players = _columns(seasons)
+    anomalies = []
+
+    diffs = [round(total - score, 2) for total, score in zip(cols['starter_sum'], cols['score'])]
+    for i, diff in enumerate(diffs):
+        season, week, team = cols['season'][i], cols['week'][i], cols['team'][i]
+        if abs(diff) > tolerance:
+            explained = cols['cancelled'][i]
+            anomalies.append(_anomaly(
+                'score_mismatch', 'warning' if explained else 'error', season, week,
+                f"starters sum to {cols['starter_sum'][i]:.2f}, reported {cols['score'][i]:.2f}"
+                + (" (cancelled game)" if explained else ''),
+                team, reported=cols['score'][i], starters=cols['starter_sum'][i], diff=diff))
+        if cols['score'][i] == 0:
+            anomalies.append(_anomaly('zero_score', 'error', season, week, "reported score is 0", team))
+        if cols['starters'][i] == 0:
+            anomalies.append(_anomaly('empty_roster', 'error', season, week, "no starters", team))
+
+    # Teams appearing more than once in a week.
+    appearances = Counter(zip(cols['season'], cols['week'], cols['team']))
+    for (season, week, team), count in appearances.items():
+        if count > 1:
+            anomalies.append(_anomaly('duplicate_matchup', 'error', season, week,
+                                      f"plays {count} times this week", team, count=count))
+
+    signatures = defaultdict(list)
+    for season, week, matchups, signature in weeks:
+        if not matchups:
+            anomalies.append(_anomaly('empty_week', 'error', season, week, "no matchups"))
+        elif signature:
+            signatures[(season, signature)].append(week)
+    for (season, _), same in signatures.items():
+        for week in same[1:]:
+            anomalies.append(_anomaly('duplicate_week', 'error', season, week,
+                                      f"same teams and scores as week {same[0]}", same_as=same[0]))
+
+    listed = defaultdict(list)
+    for season, week, team, name, nfl_team in players:
+        if name:
+            listed[(season, week, name, nfl_team)].append(team)
+    for (season, week, name, nfl_team), teams in listed.items():
+        if len(teams) > 1:
+            anomalies.append(_anomaly('duplicate_player', 'error', season, week,
+                                      f"{name} ({nfl_team or '-'}) listed {len(teams)} times",
+                                      player=name, nfl_team=nfl_team, teams=teams))
+
+    if strict:
+        for anomaly in anomalies:
+            anomaly['severity'] = 'error'
+
+    anomalies.sort(key=lambda a: (a['season'], int(a['week']), a['kind'], a.get('team') or ''))
+    errors = sum(a['severity'] == 'error' for a in anomalies)
+    return {
+        'schema': SCHEMA,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'tolerance': tolerance,
+        'ok': errors == 0,
+        'summary': {
+            'seasons': len(set(cols['season'])),
+            'team_weeks': len(cols['team']),
+            'errors': errors,
+            'warnings': len(anomalies) - errors,
+            'by_kind': dict(Counter(a['kind'] for a in anomalies))
+        },
+        'anomalies': anomalies
+    }
+
+
+def write_report(report, path=REPORT_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def print_report(report, verbose=False):
+    for a in report['anomalies']:
+        if verbose or a['severity'] == 'error':
+            where = f"{a['season']} wk {a['week']}" + (f" {a['team']}" if 'team' in a else '')
+            print(f"[{a['severity'].upper()}] {a['kind']}: {where}: {a['detail']}")
+    summary = report['summary']
+    print(f"Reconciled {summary['team_weeks']} team-weeks over {summary['seasons']} season(s): "
+          f"{summary['errors']} error(s), {summary['warnings']} warning(s)")
+
+
+def gate(fantasy_dir=FANTASY_DIR, report_path=REPORT_PATH, tolerance=TOLERANCE, strict=False):
+    """Runs the checks before an upload. Returns True when uploading may go ahead."""
+    with metrics.stage('reconcile'):
+        report = reconcile(load_seasons(fantasy_dir, rosters=True), tolerance, strict)
+    metrics.count('anomaly_errors', report['summary']['errors'])
+    metrics.count('anomaly_warnings', report['summary']['warnings'])
+    path = write_report(report, report_path)
+    print_report(report)
+    if not report['ok']:
+        print(f"[ERROR] Upload blocked by data anomalies; see {path}")
+    return report['ok']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile team scores and flag anomalies in data/fantasy.")
+    parser.add_argument('--fantasy-dir', default=FANTASY_DIR)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="allowed score difference")
+    parser.add_argument('--strict', action='store_true', help="treat warnings as errors")
+    parser.add_argument('--report', default=REPORT_PATH, help="JSON report path")
+    args = parser.parse_args(argv)
+
+    report = reconcile(load_seasons(args.fantasy_dir, rosters=True), args.tolerance, args.strict)
+    path = write_report(report, args.report)
+    print_report(report, verbose=True)
+    print(f"Report: {path}")
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
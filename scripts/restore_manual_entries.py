@@ -1,5 +1,8 @@
 import os
 
+import metrics
+from config import PLAYER_MAP_PATH
+
 # Manual entries recovered from previous file version (Step 463)
 MANUAL_RECOVERY = {
     'Julio Jones': 'https://a.espncdn.com/combiner/i?img=/i/headshots/nfl/players/full/13982.png',
@@ -90,11 +93,10 @@ MANUAL_RECOVERY = {
     'Ka\'imi Fairbairn': '2971573'
 }
 
-def restore_entries():
-    file_path = 'js/data/player-map.js'
-    
+def restore_entries(file_path=PLAYER_MAP_PATH):
     with open(file_path, 'r') as f:
         content = f.read()
+    metrics.count('bytes_read', len(content))
         
     # We want to insert these entries into the existing PLAYER_ID_MAP object.
     # The map starts at "export const PLAYER_ID_MAP = {"
@@ -155,10 +157,12 @@ def restore_entries():
         
     new_content = content[:close_brace_idx] + injection + content[close_brace_idx:]
     
-    with open(file_path, 'w') as f:
+    with metrics.stage('write'), open(file_path, 'w') as f:
         f.write(new_content)
+    metrics.count('bytes_written', len(new_content))
         
     print(f"Restored {len(MANUAL_RECOVERY)} manual entries.")
 
 if __name__ == "__main__":
-    restore_entries()
+    with metrics.run('restore_manual_entries'), metrics.stage('restore'):
+        restore_entries()
@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+
+from config import BUILD_DIR, FANTASY_DIR
+from league_model import load_seasons
+
+# Rollup cube over the whole fantasy history (the stats/rollups nodes).
+#
+# Every roster line is aggregated once into cells keyed by
+#
+#   season x week x manager x slot x position x nfl_team
+#
+# with the measures points (every line), starts (lines in a starting slot),
+# bench_points (points left on BN/RES) and lines; started points are points
+# minus bench_points. The cube is stored dictionary-encoded: each dimension
+# has a value list and the cells hold indexes into it, all as parallel
+# columns.
+#
+# At that grain the cube is about one cell per roster line (two players
+# rarely share week, slot and NFL team on one roster), so it is not
+# published: it stays a local build artifact (build/rollups/cube.json) for
+# ad-hoc rollup() calls. What the pages read are the slices in SLICES,
+# materialized from it in the same build, a few hundred to a few thousand
+# cells each:
+#
+#   stats/rollups/<slice>                e.g. season_manager_position
+#
+# A slice is {'dims', 'columns'}: one column per dimension (plain values) and
+# per measure, sorted by the dimension values.
+#
+#   python scripts/rollups.py season_manager_position --season 2024
+#   python scripts/rollups.py --dims manager,nfl_team
+
+CUBE_PATH = os.path.join(BUILD_DIR, 'rollups', 'cube.json')
+
+DIMS = ('season', 'week', 'manager', 'slot', 'position', 'nfl_team')
+MEASURES = ('points', 'starts', 'bench_points', 'lines')
+
+SLICES = {
+    'manager': ('manager',),
+    'season_manager': ('season', 'manager'),
+    'season_week_manager': ('season', 'week', 'manager'),
+    'season_manager_position': ('season', 'manager', 'position'),
+    'season_manager_slot': ('season', 'manager', 'slot'),
+    'season_manager_nfl_team': ('season', 'manager', 'nfl_team'),
+    'manager_position': ('manager', 'position'),
+    'manager_nfl_team': ('manager', 'nfl_team'),
+    'season_position': ('season', 'position'),
+    'season_nfl_team': ('season', 'nfl_team'),
+}
+
+
+def build_cube(seasons):
+    """Aggregates Season models (loaded with rosters) into the base cube."""
+    values = {dim: [] for dim in DIMS}
+    codes = {dim: {} for dim in DIMS}
+    cells = {}
+
+    def code(dim, value):
+        index = codes[dim].get(value)
+        if index is None:
+            index = codes[dim][value] = len(values[dim])
+            values[dim].append(value)
+        return index
+
+    for season in seasons:
+        s = code('season', season.season)
+        for week, _, team, _ in season.team_weeks():
+            w = code('week', week.number)
+            m = code('manager', team.name)
+            for lines, started in ((team.starters, True), (team.bench, False)):
+                for line in lines:
+                    key = (s, w, m, code('slot', line.slot), code('position', line.position),
+                           code('nfl_team', line.nfl_team))
+                    cell = cells.get(key)
+                    if cell is None:
+                        cell = cells[key] = [0.0, 0, 0.0, 0]
+                    cell[0] += line.points
+                    if started:
+                        cell[1] += 1
+                    else:
+                        cell[2] += line.points
+                    cell[3] += 1
+
+    keys = sorted(cells)
+    columns = {dim: [key[d] for key in keys] for d, dim in enumerate(DIMS)}
+    for m, measure in enumerate(MEASURES):
+        column = [cells[key][m] for key in keys]
+        columns[measure] = [round(v, 2) for v in column] if measure.endswith('points') else column
+    return {'dims': list(DIMS), 'measures': list(MEASURES), 'values': values, 'cells': columns}
+
+
+def rollup(cube, dims):
+    """Sums the cube's cells over every dimension not in `dims`; returns a slice."""
+    unknown = [dim for dim in dims if dim not in cube['dims']]
+    if unknown:
+        raise ValueError(f"Unknown dimension(s): {', '.join(unknown)}")
+    cells = cube['cells']
+    groups = {}
+    for i, key in enumerate(zip(*(cells[dim] for dim in dims))):
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = [0] * len(MEASURES)
+        for m, measure in enumerate(MEASURES):
+            group[m] += cells[measure][i]
+
+    values = cube['values']
+    rows = sorted(((tuple(values[dim][c] for dim, c in zip(dims, key)), group) for key, group in groups.items()),
+                  key=lambda row: row[0])
+    columns = {dim: [row[0][d] for row in rows] for d, dim in enumerate(dims)}
+    for m, measure in enumerate(MEASURES):
+        column = [row[1][m] for row in rows]
+        columns[measure] = [round(v, 2) for v in column] if measure.endswith('points') else column
+    return {'dims': list(dims), 'columns': columns}
+
+
+def materialize(cube, slices=SLICES):
+    return {name: rollup(cube, dims) for name, dims in slices.items()}
+
+
+def write_cube(cube, path=CUBE_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cube, f, separators=(',', ':'), ensure_ascii=False)
+    return path
+
+
+def compute_rollups(seasons, cube_path=None):
+    """The published slices {name: slice}; the cube is written to cube_path if given."""
+    cube = build_cube(seasons)
+    if cube_path:
+        write_cube(cube, cube_path)
+    return materialize(cube)
+
+
+def slice_rows(data):
+    """Rows of a slice as dicts, e.g. for printing or filtering."""
+    columns = data['columns']
+    names = data['dims'] + list(MEASURES)
+    return [dict(zip(names, row)) for row in zip(*(columns[name] for name in names))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rollups of points, starts and bench points over the league history.")
+    parser.add_argument('slice', nargs='?', default='season_manager', choices=SLICES, help="pre-materialized slice")
+    parser.add_argument('--dims', help="comma-separated dimensions for an ad-hoc rollup, e.g. manager,nfl_team")
+    parser.add_argument('--season', help="only rows of this season")
+    args = parser.parse_args(argv)
+
+    cube = build_cube(load_seasons(FANTASY_DIR, rosters=True))
+    try:
+        data = rollup(cube, args.dims.split(',')) if args.dims else materialize(cube, {args.slice: SLICES[args.slice]})[args.slice]
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    print(f"{len(cube['cells']['lines'])} cells, {sum(cube['cells']['lines'])} player lines")
+
+    dims = data['dims']
+    print(" ".join(f"{dim:<18}" for dim in dims) + f" {'points':>9} {'starts':>7} {'bench':>9} {'lines':>6}")
+    for row in slice_rows(data):
+        if args.season and row.get('season', args.season) != args.season:
+            continue
+        print(" ".join(f"{str(row[dim]) or '-':<18}" for dim in dims)
+              + f" {row['points']:>9.2f} {row['starts']:>7} {row['bench_points']:>9.2f} {row['lines']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+import argparse
+
+from config import FANTASY_DIR
+from league_model import load_seasons
+
+# All-play records and schedule luck (the stats/schedule_luck node).
+#
+# Head-to-head results in a four-team league mostly measure who you happened
+# to play. Here every regular-season week of every season goes into one
+# season x week x team score matrix (plus a matching opponent matrix), and
+# each row is compared against itself:
+#
+#   all-play       the record a team would have playing everyone, every week
+#   expected wins  all-play win share per week, summed (ties count half)
+#   luck           actual H2H wins minus expected wins
+#   sos            mean season all-play pct of the opponents actually faced
+#   median beats   weeks scoring above the league median that week
+#
+# Playoff and Super Bowl weeks are left out, like the standings.
+#
+#   python scripts/schedule_luck.py [--season 2024]
+
+
+def score_matrix(seasons):
+    """Builds the regular-season matrices for Season models (scores only is enough).
+
+    Returns {'seasons', 'teams', 'scores', 'opponents'}: scores[s][w][t]
+    is team t's score in week w of seasons[s] (None if it did not play),
+    opponents[s][w][t] the opponent's team index.
+    """
+    names = []
+    index = {}
+    labels = []
+    scores = []
+    opponents = []
+    for season in seasons:
+        weeks = []
+        opps = []
+        for week in season.weeks:
+            if season.phase(week) != 'regular':
+                continue
+            row = {}
+            opp = {}
+            for matchup in week.matchups:
+                t1, t2 = matchup.team1, matchup.team2
+                if not t1 or not t2:
+                    continue
+                for team in (t1, t2):
+                    if team.name not in index:
+                        index[team.name] = len(names)
+                        names.append(team.name)
+                row[index[t1.name]] = t1.score
+                row[index[t2.name]] = t2.score
+                opp[index[t1.name]] = index[t2.name]
+                opp[index[t2.name]] = index[t1.name]
+            weeks.append(row)
+            opps.append(opp)
+        labels.append(season.season)
+        scores.append(weeks)
+        opponents.append(opps)
+
+    # Dense rows once every team is known.
+    width = len(names)
+    return {
+        'seasons': labels,
+        'teams': names,
+        'scores': [[[row.get(t) for t in range(width)] for row in weeks] for weeks in scores],
+        'opponents': [[[row.get(t) for t in range(width)] for row in weeks] for weeks in opponents]
+    }
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def _pct(w, l, t):
+    games = w + l + t
+    return round((w + t / 2) / games, 4) if games else 0.0
+
+
+def compute_schedule_luck(seasons):
+    """The stats/schedule_luck payload for Season models."""
+    matrix = score_matrix(seasons)
+    teams = matrix['teams']
+    width = len(teams)
+    result = {'seasons': {}, 'all_time': []}
+    totals = [dict(w=0, l=0, t=0, apw=0, apl=0, apt=0, expected=0.0, median_beats=0.0, weeks=0) for _ in teams]
+
+    for label, weeks, opponents in zip(matrix['seasons'], matrix['scores'], matrix['opponents']):
+        rows = [dict(w=0, l=0, t=0, apw=0, apl=0, apt=0, expected=0.0, median_beats=0.0, weeks=0,
+                     pf=0.0, pa=0.0, opponents=[], by_week=[]) for _ in teams]
+        medians = []
+
+        for scores, opps in zip(weeks, opponents):
+            present = [t for t in range(width) if scores[t] is not None]
+            if len(present) < 2:
+                continue
+            median = _median([scores[t] for t in present])
+            medians.append(round(median, 2))
+            for t in present:
+                s = scores[t]
+                row = rows[t]
+                # All-play: this team against every other score of the week.
+                above = sum(scores[o] < s for o in present)
+                below = sum(scores[o] > s for o in present)
+                level = len(present) - 1 - above - below
+                row['apw'] += above
+                row['apl'] += below
+                row['apt'] += level
+                row['expected'] += (above + level / 2) / (len(present) - 1)
+
+                o = opps[t]
+                opp = scores[o]
+                row['w' if s > opp else 'l' if s < opp else 't'] += 1
+                row['pf'] += s
+                row['pa'] += opp
+                row['opponents'].append(o)
+
+                beat = 1 if s > median else 0.5 if s == median else 0
+                row['median_beats'] += beat
+                row['by_week'].append(beat)
+                row['weeks'] += 1
+
+        all_play_pct = {t: _pct(r['apw'], r['apl'], r['apt']) for t, r in enumerate(rows) if r['weeks']}
+        season_rows = []
+        for t, row in enumerate(rows):
+            if not row['weeks']:
+                continue
+            faced = row['opponents']
+            season_rows.append({
+                'name': teams[t],
+                'record': {'w': row['w'], 'l': row['l'], 't': row['t']},
+                'all_play': {'w': row['apw'], 'l': row['apl'], 't': row['apt'],
+                             'pct': all_play_pct[t]},
+                'expected_wins': round(row['expected'], 2),
+                'luck': round(row['w'] + row['t'] / 2 - row['expected'], 2) or 0.0,
+                'sos': round(sum(all_play_pct[o] for o in faced) / len(faced), 4),
+                'opp_ppg': round(row['pa'] / row['weeks'], 2),
+                'ppg': round(row['pf'] / row['weeks'], 2),
+                'median_beats': row['median_beats'],
+                'median_beat_rate': round(row['median_beats'] / row['weeks'], 4),
+                'median_by_week': row['by_week']
+            })
+            total = totals[t]
+            for key in ('w', 'l', 't', 'apw', 'apl', 'apt', 'expected', 'median_beats', 'weeks'):
+                total[key] += row[key]
+
+        season_rows.sort(key=lambda r: -r['luck'])
+        result['seasons'][label] = {'teams': season_rows, 'weekly_median': medians}
+
+    for t, total in enumerate(totals):
+        if not total['weeks']:
+            continue
+        result['all_time'].append({
+            'name': teams[t],
+            'record': {'w': total['w'], 'l': total['l'], 't': total['t']},
+            'all_play': {'w': total['apw'], 'l': total['apl'], 't': total['apt'],
+                         'pct': _pct(total['apw'], total['apl'], total['apt'])},
+            'expected_wins': round(total['expected'], 2),
+            'luck': round(total['w'] + total['t'] / 2 - total['expected'], 2) or 0.0,
+            'median_beat_rate': round(total['median_beats'] / total['weeks'], 4)
+        })
+    result['all_time'].sort(key=lambda r: -r['luck'])
+
+    seasonal = [{'name': r['name'], 'season': label, 'luck': r['luck']}
+                for label, s in result['seasons'].items() for r in s['teams']]
+    if seasonal:
+        result['luckiest'] = max(seasonal, key=lambda r: r['luck'])
+        result['unluckiest'] = min(seasonal, key=lambda r: r['luck'])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="All-play records and schedule luck per season.")
+    parser.add_argument('--season', help="only this season")
+    args = parser.parse_args(argv)
+
+    luck = compute_schedule_luck(load_seasons(FANTASY_DIR))
+    header = f"{'team':<18} {'W-L-T':>8} {'all-play':>10} {'pct':>6} {'xW':>6} {'luck':>6} {'sos':>6} {'>med':>6}"
+    for season, data in luck['seasons'].items():
+        if args.season and season != args.season:
+            continue
+        print(f"\n{season}\n{header}")
+        for r in data['teams']:
+            rec, ap = r['record'], r['all_play']
+            print(f"{r['name']:<18} {rec['w']}-{rec['l']}-{rec['t']:<4} {ap['w']}-{ap['l']}-{ap['t']:<5} "
+                  f"{ap['pct']:>6.3f} {r['expected_wins']:>6.2f} {r['luck']:>+6.2f} {r['sos']:>6.3f} "
+                  f"{r['median_beat_rate']:>6.2f}")
+    if not args.season and luck['all_time']:
+        print("\nAll time")
+        for r in luck['all_time']:
+            print(f"  {r['name']:<18} luck {r['luck']:+.2f}  all-play {r['all_play']['pct']:.3f}  "
+                  f"median beat {r['median_beat_rate']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import random
+
+# Synthetic league generator.
+#
+# Writes fantasy_data_*.json / draft_data_*.json files with exactly the same
+# schema as the scraped ones in data/ (string scores and points, "Win, 34-28"
+# statuses, "@KC" opponents, BN/RES bench slots, byes), plus a Sleeper-style
+# players dump for generate_sleeper_map.py. Used by bench_pipeline.py to see how
+# the pipeline scales beyond our seven seasons of four teams.
+#
+#   python scripts/synth_league.py build/synth --teams 12 --seasons 20
+
+NFL_TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET',
+    'GB', 'HOU', 'IND', 'JAX', 'KC', 'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO',
+    'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS'
+]
+
+# Lineup used by the league: 9 starters (one W/R flex) and a bench.
+STARTER_SLOTS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'W/R', 'K', 'DEF']
+FLEX_POSITIONS = ['RB', 'WR']
+
+# Mean weekly fantasy points per position (spread is half the mean).
+POINTS_MEAN = {'QB': 19.0, 'RB': 12.0, 'WR': 11.0, 'TE': 7.5, 'K': 8.0, 'DEF': 7.0}
+
+# Share of each position in the player pool / on a bench.
+BENCH_POSITIONS = ['RB', 'WR', 'WR', 'RB', 'QB', 'TE', 'WR', 'RB', 'DEF', 'K']
+
+FIRST_NAMES = ['James', 'Josh', 'Derrick', 'Justin', 'Travis', 'Mike', 'Chris', 'Aaron',
+               'Jalen', 'Davante', 'Tyreek', 'Cooper', 'Saquon', 'Lamar', 'Patrick', 'Amari',
+               'Jonathan', 'Kyle', 'Mark', 'Brandon', 'Calvin', 'Deebo', 'Isiah', 'Rachaad']
+SYLLABLES = ['ro', 'man', 'del', 'ka', 'son', 'ber', 'ti', 'lo', 'ver', 'an', 'mo', 'ley',
+             'ga', 'ric', 'ton', 'vi', 'la', 'sha', 'en', 'ford']
+DEF_NAMES = ['Cardinals', 'Falcons', 'Ravens', 'Bills', 'Panthers', 'Bears', 'Bengals', 'Browns',
+             'Cowboys', 'Broncos', 'Lions', 'Packers', 'Texans', 'Colts', 'Jaguars', 'Chiefs',
+             'Chargers', 'Rams', 'Raiders', 'Dolphins', 'Vikings', 'Patriots', 'Saints', 'Giants',
+             'Jets', 'Eagles', 'Steelers', 'Seahawks', '49ers', 'Buccaneers', 'Titans', 'Commanders']
+
+
+def _last_name(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def make_player_pool(rng, size):
+    """Returns a list of player dicts (full name, position, nfl_team, ids)."""
+    pool = []
+    seen = set()
+    for i, team in enumerate(NFL_TEAMS):
+        pool.append({'name': f"{DEF_NAMES[i]} D/ST", 'short': DEF_NAMES[i], 'position': 'DEF',
+                     'nfl_team': team, 'espn_id': str(-16000 - i)})
+
+    positions = [p for p in BENCH_POSITIONS if p != 'DEF']
+    while len(pool) < size:
+        name = f"{rng.choice(FIRST_NAMES)} {_last_name(rng)}"
+        if name in seen:
+            continue
+        seen.add(name)
+        first, last = name.split(' ', 1)
+        pool.append({'name': name, 'short': f"{first[0]}. {last}", 'position': rng.choice(positions),
+                     'nfl_team': rng.choice(NFL_TEAMS), 'espn_id': str(3000000 + len(pool))})
+    return pool
+
+
+def round_robin(teams, week):
+    """Circle-method pairing for a given week (a bye is dropped for odd counts)."""
+    order = list(teams) + ([None] if len(teams) % 2 else [])
+    n = len(order)
+    shift = (week - 1) % (n - 1)
+    rotated = [order[0]] + order[1:][shift:] + order[1:][:shift]
+    pairs = [(rotated[i], rotated[n - 1 - i]) for i in range(n // 2)]
+    return [(a, b) for a, b in pairs if a is not None and b is not None]
+
+
+def nfl_week(rng, bye_teams):
+    """Random NFL slate: {team: (opponent, home, points_for, points_against)}."""
+    playing = [t for t in NFL_TEAMS if t not in bye_teams]
+    rng.shuffle(playing)
+    games = {}
+    for home, away in zip(playing[::2], playing[1::2]):
+        home_pts, away_pts = rng.randint(3, 45), rng.randint(0, 42)
+        games[home] = (away, True, home_pts, away_pts)
+        games[away] = (home, False, away_pts, home_pts)
+    return games
+
+
+def _status(points_for, points_against):
+    if points_for > points_against:
+        result = 'Win'
+    elif points_for < points_against:
+        result = 'Loss'
+    else:
+        result = 'Tie'
+    return f"{result}, {points_for}-{points_against}"
+
+
+def player_line(rng, player, slot, games):
+    game = games.get(player['nfl_team'])
+    if game is None:
+        opponent, status, points = 'Bye', '', 0.0
+    else:
+        opp, home, pf, pa = game
+        opponent = opp if home else f"@{opp}"
+        status = _status(pf, pa)
+        mean = POINTS_MEAN[player['position']]
+        points = max(0.0, round(rng.gauss(mean, mean / 2), 1))
+
+    return {
+        'position': slot,
+        'name': player['short'],
+        'position_in_team': player['position'],
+        'nfl_team': '' if player['position'] == 'DEF' else player['nfl_team'],
+        'opponent': opponent,
+        'status': status,
+        'fantasy_points': f"{points:.2f}"
+    }
+
+
+def pick_lineup(roster):
+    """Fills STARTER_SLOTS in roster order; everything else goes to the bench."""
+    remaining = list(roster)
+    starters = []
+    for slot in STARTER_SLOTS:
+        allowed = FLEX_POSITIONS if slot == 'W/R' else [slot]
+        for player in remaining:
+            if player['position'] in allowed:
+                starters.append((slot, player))
+                remaining.remove(player)
+                break
+    return starters, remaining
+
+
+def draft(rng, pool, teams, roster_size):
+    """Snake draft of roster_size players per team. Returns {team: [(pick, player)]}."""
+    available = list(pool)
+    rng.shuffle(available)
+    needs = {team: list(STARTER_SLOTS) for team in teams}
+    rosters = {team: [] for team in teams}
+    pick = 0
+
+    for rnd in range(roster_size):
+        order = teams if rnd % 2 == 0 else teams[::-1]
+        for team in order:
+            pick += 1
+            open_slots = needs[team]
+            choice = None
+            for player in available:
+                fits = player['position'] in open_slots or ('W/R' in open_slots and player['position'] in FLEX_POSITIONS)
+                if fits or not open_slots:
+                    choice = player
+                    break
+            choice = choice or available[0]
+            available.remove(choice)
+            if choice['position'] in open_slots:
+                open_slots.remove(choice['position'])
+            elif 'W/R' in open_slots and choice['position'] in FLEX_POSITIONS:
+                open_slots.remove('W/R')
+            rosters[team].append((pick, choice))
+    return rosters
+
+
+def generate_season(rng, season, teams, pool, weeks, bench_size, reserve_size):
+    roster_size = len(STARTER_SLOTS) + bench_size + reserve_size
+    rosters = draft(rng, pool, teams, roster_size)
+
+    draft_data = {
+        'season': str(season),
+        'scraped_at': f"{season + 1}-02-08T12:00:00.000000",
+        'teams': {
+            team: [{'pick': pick, 'name': p['name'], 'position': p['position'], 'nfl_team': p['nfl_team']}
+                   for pick, p in picks]
+            for team, picks in rosters.items()
+        }
+    }
+
+    byes = {}
+    for team in NFL_TEAMS:
+        byes.setdefault(rng.randint(5, 14), set()).add(team)
+
+    fantasy_weeks = {}
+    for week in range(1, weeks + 1):
+        games = nfl_week(rng, byes.get(week, set()))
+        matchups = []
+        for home, away in round_robin(teams, week):
+            matchup = {}
+            for key, team in (('team1', home), ('team2', away)):
+                roster = [p for _, p in rosters[team]]
+                starters, rest = pick_lineup(roster)
+                reserve = rest[len(rest) - reserve_size:] if reserve_size else []
+                bench = rest[:len(rest) - len(reserve)]
+
+                starter_lines = [player_line(rng, p, slot, games) for slot, p in starters]
+                bench_lines = ([player_line(rng, p, 'BN', games) for p in bench] +
+                               [player_line(rng, p, 'RES', games) for p in reserve])
+                score = sum(round(float(p['fantasy_points']), 2) for p in starter_lines)
+                matchup[key] = {'name': team, 'score': f"{score:.2f}",
+                                'starters': starter_lines, 'bench': bench_lines}
+            matchups.append(matchup)
+        fantasy_weeks[str(week)] = {'matchups': matchups}
+
+    fantasy_data = {
+        'league_id': '9000000',
+        'season': str(season),
+        'scraped_at': f"{season + 1}-02-08T14:00:00.000000",
+        'weeks': fantasy_weeks
+    }
+    return fantasy_data, draft_data
+
+
+def sleeper_dump(rng, pool, extra):
+    """Sleeper /players/nfl style dump: our pool plus `extra` unrelated players."""
+    dump = {}
+    for i, player in enumerate(pool):
+        first, _, last = player['name'].partition(' ')
+        dump[str(1000 + i)] = {'first_name': first, 'last_name': last, 'position': player['position'],
+                               'team': player['nfl_team'], 'espn_id': player['espn_id']}
+    for i in range(extra):
+        dump[str(900000 + i)] = {'first_name': rng.choice(FIRST_NAMES), 'last_name': _last_name(rng),
+                                 'position': rng.choice(BENCH_POSITIONS), 'team': rng.choice(NFL_TEAMS),
+                                 'espn_id': str(5000000 + i) if i % 3 else None}
+    return dump
+
+
+def generate_league(out_dir, teams=4, seasons=7, weeks=17, bench=6, reserve=0,
+                    start_season=2019, sleeper_extra=5000, seed=0):
+    """Writes fantasy/, draft/ and sleeper_players.json under out_dir. Returns the paths."""
+    rng = random.Random(seed)
+    team_names = [f"team_{i + 1:02d}" for i in range(teams)]
+    roster_size = len(STARTER_SLOTS) + bench + reserve
+    pool = make_player_pool(rng, max(200, teams * roster_size * 2))
+
+    fantasy_dir = os.path.join(out_dir, 'fantasy')
+    draft_dir = os.path.join(out_dir, 'draft')
+    os.makedirs(fantasy_dir, exist_ok=True)
+    os.makedirs(draft_dir, exist_ok=True)
+
+    for season in range(start_season, start_season + seasons):
+        fantasy_data, draft_data = generate_season(rng, season, team_names, pool, weeks, bench, reserve)
+        with open(os.path.join(fantasy_dir, f"fantasy_data_{season}.json"), 'w', encoding='utf-8') as f:
+            json.dump(fantasy_data, f, indent=2)
+        with open(os.path.join(draft_dir, f"draft_data_{season}.json"), 'w', encoding='utf-8') as f:
+            json.dump(draft_data, f, indent=2)
+
+    sleeper_path = os.path.join(out_dir, 'sleeper_players.json')
+    with open(sleeper_path, 'w', encoding='utf-8') as f:
+        json.dump(sleeper_dump(rng, pool, sleeper_extra), f)
+
+    return {'fantasy_dir': fantasy_dir, 'draft_dir': draft_dir, 'sleeper_players': sleeper_path}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Topina-style league.")
+    parser.add_argument('out_dir')
+    parser.add_argument('--teams', type=int, default=4)
+    parser.add_argument('--seasons', type=int, default=7)
+    parser.add_argument('--weeks', type=int, default=17)
+    parser.add_argument('--bench', type=int, default=6, help="BN slots per roster")
+    parser.add_argument('--reserve', type=int, default=0, help="RES slots per roster")
+    parser.add_argument('--start-season', type=int, default=2019)
+    parser.add_argument('--sleeper-extra', type=int, default=5000,
+                        help="unrelated players added to the Sleeper dump")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_league(args.out_dir, args.teams, args.seasons, args.weeks, args.bench,
+                            args.reserve, args.start_season, args.sleeper_extra, args.seed)
+    print(f"[OK] {args.seasons} season(s) of {args.teams} teams written to {args.out_dir}")
+    for label, path in paths.items():
+        print(f"  {label}: {path}")
+
+
+if __name__ == "__main__":
+    main()
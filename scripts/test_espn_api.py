@@ -1,24 +1,18 @@
-import requests
-import json
+import http_client
 
 players = ["Garrett Wilson", "A.J. Brown", "Marvin Harrison Jr.", "Tetairoa McMillan", "Caleb Williams"]
 
-url = "https://site.api.espn.com/apis/common/v3/search"
-
-for p in players:
-    params = {
-        "limit": 5,
-        "type": "player",
-        "sport": "football",
-        "league": "nfl",
-        "q": p
-    }
+def main():
     try:
-        res = requests.get(url, params=params)
-        data = res.json()
+        results = http_client.espn_search_many(players)
+    except Exception as e:
+        print(f"Error: {e}")
+        return
+
+    for p, items in results.items():
         print(f"Searching for: {p}")
-        if data.get('items'):
-            for item in data['items']:
+        if items:
+            for item in items:
                 print(f"  Result: {item.get('displayName')} (ID: {item.get('id')})")
                 if item.get('headshot'):
                     print(f"    Headshot: {item.get('headshot').get('href')}")
@@ -32,6 +26,7 @@ for p in players:
 
         else:
              print(f"Name: {p} - NO RESULTS")
-    except Exception as e:
-        print(f"Error for {p}: {e}")
-    print("-" * 20)
+        print("-" * 20)
+
+if __name__ == "__main__":
+    main()
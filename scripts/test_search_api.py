@@ -1,25 +1,15 @@
-import requests
-import json
+import http_client
+
+# Compares ESPN search parameter variants. Answers are recorded in the shared
+# HTTP cache (build/http_cache.db), so re-runs replay instead of re-querying.
 
 def search_variant(name, label, params):
-    base_url = "https://site.api.espn.com/apis/common/v3/search"
-    default_params = {
-        "limit": 5,
-        "type": "player",
-        "sport": "football",
-        "league": "nfl",
-        "q": name
-    }
-    # update defaults
-    default_params.update(params)
-    
     print(f"Searching {name} [{label}]...")
     try:
-        res = requests.get(base_url, params=default_params)
-        data = res.json()
-        return data
+        return http_client.espn_search(name, **params)
     except Exception as e:
-        return {"error": str(e)}
+        print(f"  Error: {e}")
+        return []
 
 players_to_test = ["Andrew Luck", "Tom Brady"]
 variations = [
@@ -29,14 +19,12 @@ variations = [
     ("Active False", {"active": "false"}), # Guessing
 ]
 
-results = {}
-
-for p in players_to_test:
-    results[p] = {}
-    for label, params in variations:
-        results[p][label] = search_variant(p, label, params)
-
-with open("search_results.json", "w") as f:
-    json.dump(results, f, indent=2)
+def main():
+    for p in players_to_test:
+        for label, params in variations:
+            items = search_variant(p, label, params)
+            top = items[0].get('displayName') if items else '-'
+            print(f"  {len(items)} result(s), top: {top}")
 
-print("Results written to search_results.json")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import sys
+
+# Single entry point for the league data tooling.
+#
+#   python scripts/topina.py upload [--publisher admin] [--since REV] [--watch]
+#   python scripts/topina.py stats standings 2024
+#   python scripts/topina.py validate-images
+#   python scripts/topina.py build-map [--merge]
+#   python scripts/topina.py inspect {sleeper,map,compact,luck,careers,reconcile,rollups}
+#
+# Startup only imports argparse: the module behind a subcommand (and with it
+# firebase_admin or requests, where needed) is imported when that command runs,
+# so `topina --help` and the local-only commands never load the Firebase SDK or
+# an HTTP stack. Arguments after the subcommand go to that script's own parser,
+# e.g. `topina upload --help` lists build_artifacts.py's options. Paths and the
+# database URL come from config.py.
+
+
+def _upload(argv):
+    import build_artifacts
+    import metrics
+
+    with metrics.run('upload'):
+        build_artifacts.main(argv)
+
+
+def _stats(argv):
+    import history_db
+
+    history_db.main(argv)
+
+
+def _validate_images(argv):
+    import metrics
+    import validate_images
+
+    with metrics.run('validate_images'):
+        validate_images.main(argv)
+
+
+def _build_map(argv):
+    import generate_sleeper_map
+    import metrics
+
+    with metrics.run('generate_sleeper_map'):
+        generate_sleeper_map.main(argv)
+
+
+def _inspect(argv):
+    parser = argparse.ArgumentParser(prog='topina inspect', description="Local sanity checks on the data files.")
+    sub = parser.add_subparsers(dest='target', required=True)
+    p = sub.add_parser('sleeper', help="show the ids Sleeper has for some players")
+    p.add_argument('names', nargs='*', help="player names (default: a few well-known ones)")
+    p = sub.add_parser('map', help="check players resolve in js/data/player-map.js")
+    p.add_argument('names', nargs='*', help="player names (default: the usual problem cases)")
+    sub.add_parser('compact', help="round-trip every season through the compact schema")
+    p = sub.add_parser('luck', help="all-play records and schedule luck")
+    p.add_argument('--season', help="only this season")
+    p = sub.add_parser('careers', help="per-player career index and leaderboards")
+    p.add_argument('player', nargs='?', help="player name (default: leaderboards)")
+    p.add_argument('--top', type=int, default=10)
+    p = sub.add_parser('reconcile', help="score reconciliation and data anomaly report")
+    p.add_argument('--strict', action='store_true', help="treat warnings as errors")
+    p = sub.add_parser('rollups', help="points, starts and bench points by season/week/manager/slot/team")
+    p.add_argument('slice', nargs='?', help="pre-materialized slice (default: season_manager)")
+    p.add_argument('--dims', help="comma-separated dimensions for an ad-hoc rollup")
+    p.add_argument('--season', help="only rows of this season")
+    args = parser.parse_args(argv)
+
+    if args.target == 'sleeper':
+        import inspect_sleeper
+        inspect_sleeper.check_sleeper_data(args.names or inspect_sleeper.SAMPLES)
+    elif args.target == 'map':
+        import verify_fix
+        verify_fix.verify_fix(args.names or verify_fix.TARGETS)
+    elif args.target == 'luck':
+        import schedule_luck
+        schedule_luck.main(['--season', args.season] if args.season else [])
+    elif args.target == 'careers':
+        import player_careers
+        player_careers.main(([args.player] if args.player else []) + ['--top', str(args.top)])
+    elif args.target == 'reconcile':
+        import reconcile
+        return reconcile.main(['--strict'] if args.strict else [])
+    elif args.target == 'rollups':
+        import rollups
+        return rollups.main(([args.slice] if args.slice else []) + (['--dims', args.dims] if args.dims else [])
+                            + (['--season', args.season] if args.season else []))
+    else:
+        import compact_schema
+        compact_schema.main()
+
+
+COMMANDS = {
+    'upload': (_upload, "build changed artifacts and publish them to RTDB (build_artifacts.py)"),
+    'stats': (_stats, "query the local SQLite history: standings, h2h, player, ... (history_db.py)"),
+    'validate-images': (_validate_images, "find drafted players without an ESPN headshot"),
+    'build-map': (_build_map, "generate the player -> ESPN id map from the Sleeper dump"),
+    'inspect': (_inspect, "local checks and reports: sleeper ids, player map, compact, luck, careers, reconcile, rollups"),
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    width = max(len(name) for name in COMMANDS)
+    parser = argparse.ArgumentParser(
+        prog='topina',
+        description="Topina league data tooling.",
+        epilog="commands:\n" + "\n".join(f"  {name:<{width}}  {text}" for name, (_, text) in COMMANDS.items())
+               + "\n\nRun `topina <command> --help` for the options of a command.",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('command', choices=COMMANDS, metavar='command')
+    # Only the command name is parsed here; the rest belongs to the command.
+    args = parser.parse_args(argv[:1])
+    handler, _ = COMMANDS[args.command]
+    # Sub-parsers take their prog from argv[0]: show "topina upload", not "topina.py".
+    sys.argv[0] = f"topina {args.command}"
+    return handler(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
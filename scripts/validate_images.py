@@ -1,108 +1,64 @@
-import requests
+import argparse
 import json
-import re
 import os
-import time
-import ast
+
+import http_client
+import metrics
+from config import DATABASE_URL, DRAFT_DIR, VALIDATION_REPORT_PATH
+from player_map import load_player_map
 
 # Configuration
-FIREBASE_URL = "https://topina-9cd75-default-rtdb.firebaseio.com"
 SEASONS = range(2019, 2026)
-# Use absolute path based on user workspace if running from root, or relative
-# We will assume running from project root
-PLAYER_MAP_PATH = "js/data/player-map.js"
-
-def load_player_map():
-    """Parses js/data/player-map.js to get the current manual mappings."""
-    if not os.path.exists(PLAYER_MAP_PATH):
-        print(f"Error: {PLAYER_MAP_PATH} not found.")
-        return {}
-    
-    with open(PLAYER_MAP_PATH, 'r') as f:
-        content = f.read()
-    
-    # Regex to extract the dictionary content inside PLAYER_ID_MAP = { ... };
-    match = re.search(r"export const PLAYER_ID_MAP = ({[\s\S]*?});", content)
-    if not match:
-        print("Error: Could not find PLAYER_ID_MAP in file.")
-        return {}
-    
-    js_obj = match.group(1)
-    
-    # Remove lines that are just comments or empty
-    lines = []
-    for line in js_obj.split('\n'):
-        # simple comment removal //...
-        clean_line = re.sub(r"//.*", "", line).strip()
-        if clean_line:
-            lines.append(clean_line)
-    
-    clean_js = "\n".join(lines)
-    # Remove trailing commas before closing braces (common in JS, invalid in Python/JSON)
-    clean_js = re.sub(r",\s*}", "}", clean_js)
-    
-    # Python dict syntax is very close to this JS object syntax (quoted keys and values)
-    # create a safe evaluation env
-    try:
-        data = ast.literal_eval(clean_js)
-        return data
-    except Exception as e:
-        print(f"Parsing failed with ast, falling back to regex extraction: {e}")
-        # manual extraction
-        manual_map = {}
-        for line in js_obj.split('\n'):
-            # Look for 'Name': 'ID'
-            m = re.search(r"['\"](.+?)['\"]\s*:\s*['\"](.+?)['\"]", line)
-            if m:
-                manual_map[m.group(1)] = m.group(2)
-        return manual_map
-
 def fetch_draft_data(year):
-    url = f"{FIREBASE_URL}/draft/draft_data_{year}.json"
+    """The draft as currently in RTDB: always read live, never from the HTTP cache."""
+    url = f"{DATABASE_URL}/draft/draft_data_{year}.json"
     try:
-        resp = requests.get(url)
-        if resp.status_code == 200:
-            return resp.json()
+        return http_client.client().get_json(url, cache=False)
+    except http_client.CacheMiss:
+        # Offline: the local copy is what gets uploaded anyway.
+        path = os.path.join(DRAFT_DIR, f"draft_data_{year}.json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
     except Exception as e:
         print(f"Error fetching data for {year}: {e}")
     return None
 
 def search_espn_player(name):
     """Searches ESPN API for a player."""
-    url = f"https://site.api.espn.com/apis/common/v3/search?limit=5&type=player&sport=football&league=nfl&q={requests.utils.quote(name)}"
     try:
-        resp = requests.get(url, timeout=5)
-        if resp.status_code == 200:
-            data = resp.json()
-            if data.get('items'):
-                return data['items'] # Return all items
-    except:
-        pass
+        return http_client.espn_search(name)
+    except http_client.CacheMiss:
+        print(f"  [offline] no recorded search for {name}")
+    except Exception as e:
+        print(f"  Search failed for {name}: {e}")
     return []
 
 def check_image_url(url):
     """Checks if an image URL is valid (HTTP 200)."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0'
-        }
-        resp = requests.head(url, headers=headers, timeout=3)
-        return resp.status_code == 200
-    except:
-        return False
+    return http_client.image_ok(url)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check every drafted player has a usable headshot.")
+    parser.add_argument('--offline', action='store_true', help="replay recorded API answers only")
+    parser.add_argument('--refresh', action='store_true', help="ignore recorded API answers")
+    args = parser.parse_args(argv)
+    if args.offline or args.refresh:
+        http_client.configure(mode='replay' if args.offline else 'refresh')
 
-def main():
     print("--- Starting Automated Player Image Validation ---")
     
     # 1. Load Map
-    player_map = load_player_map()
+    with metrics.stage('load_map'):
+        player_map = load_player_map()
     print(f"Loaded {len(player_map)} manual mappings.")
     
     all_players = set()
     
     # 2. Fetch all drafted players
     for year in SEASONS:
-        data = fetch_draft_data(year)
+        with metrics.stage('fetch_drafts'):
+            data = fetch_draft_data(year)
         if not data or 'teams' not in data:
             continue
         
@@ -132,24 +88,28 @@ def main():
     
     # Sort for consistent output
     sorted_players = sorted(list(all_players))
+
+    # Resolve every unmapped player up front: concurrent, coalesced and cached.
+    with metrics.stage('espn_search'):
+        unmapped = [p for p in sorted_players if p not in player_map]
+        searches = dict(zip(unmapped, http_client.client().map(search_espn_player, unmapped)))
     
     for i, player in enumerate(sorted_players):
         # Progress
         if i > 0 and i % 20 == 0:
             print(f"Processed {i}/{len(sorted_players)}...")
-            
-        time.sleep(0.05) # Rate limiting
         
         status = "OK"
         image_url = None
         
         # Check Map
+        metrics.cache('player_map', player in player_map)
         if player in player_map:
             val = player_map[player]
             if val.startswith('http'):
                 image_url = val
             else:
-                image_url = f"https://a.espncdn.com/combiner/i?img=/i/headshots/nfl/players/full/{val}.png&w=350&h=254&scale=crop"
+                image_url = http_client.headshot_url(val)
             
             # For mapped players, we assume the URL is correct unless checked
             # We can enable strict checking if desired
@@ -159,7 +119,7 @@ def main():
             
         else:
             # Check API
-            items = search_espn_player(player)
+            items = searches[player]
             found_match = False
             best_img = None
             
@@ -208,7 +168,7 @@ def main():
             print(f"- {p}")
             
     # Optional: Generate a JSON report file
-    with open('validation_report.json', 'w') as f:
+    with open(VALIDATION_REPORT_PATH, 'w') as f:
         json.dump({
             'missing': missing_images,
             'broken': broken_images,
@@ -216,4 +176,5 @@ def main():
         }, f, indent=2)
 
 if __name__ == "__main__":
-    main()
+    with metrics.run('validate_images'):
+        main()
@@ -1,19 +1,16 @@
-import sys
-import os
-sys.path.append(os.getcwd())
-from scripts.validate_images import load_player_map
+from player_map import load_player_map
 
-def verify_fix():
+TARGETS = [
+    "Tom Brady", "Julio Jones", "Rob Gronkowski", 
+    "Todd Gurley", "Drake Maye", "Caleb Williams",
+    "Puka Nacua", "A.J. Brown"
+]
+
+def verify_fix(targets=TARGETS):
     print("--- Verifying Map Installation ---")
     player_map = load_player_map()
     print(f"Total Mapped Players: {len(player_map)}")
     
-    targets = [
-        "Tom Brady", "Julio Jones", "Rob Gronkowski", 
-        "Todd Gurley", "Drake Maye", "Caleb Williams",
-        "Puka Nacua", "A.J. Brown"
-    ]
-    
     print("\nChecking specific targets in Map:")
     for t in targets:
         if t in player_map: